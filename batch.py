@@ -0,0 +1,231 @@
+"""Translate a directory of media, subtitle and text files to ISL offline.
+
+Every media file (the formats /upload accepts), .srt subtitle file and .txt
+file under INPUT_DIR is translated by a pool of worker threads sharing one
+Whisper pool. For each input, OUTPUT_DIR gets, at the same relative path:
+
+    <name>.isl.json   the result /jobs returns (text, ISL glosses, SiGML URLs, timeline)
+    <name>.sigml      every sign of the result merged into one SiGML document
+
+    python batch.py INPUT_DIR OUTPUT_DIR [--workers 4] [--processes 1] [--force]
+
+The JSON is written last, so an interrupted run resumes where it stopped:
+inputs whose JSON is newer than they are are skipped (--force redoes them).
+Transcripts also go through the transcript cache shared with the server.
+Subtitle cues are translated one by one and keep their timing on the sign
+timeline; plain text gets none.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
+
+import main
+
+TEXT_EXTENSIONS = {'.srt', '.txt'}
+RESULT_SUFFIX = '.isl.json'
+BUNDLE_SUFFIX = '.sigml'
+SRT_TIME_PATTERN = re.compile(r'(\d+):(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(\d+):(\d{2}):(\d{2})[,.](\d{3})')
+SRT_TAG_PATTERN = re.compile(r'<[^>]+>|\{\\[^}]*\}')
+
+
+def input_files(input_dir):
+    """Relative paths of the translatable files under input_dir, sorted"""
+    found = []
+    for dir_path, dir_names, file_names in os.walk(input_dir):
+        dir_names[:] = sorted(name for name in dir_names if not name.startswith('.'))
+        for file_name in file_names:
+            extension = os.path.splitext(file_name)[1].lower()
+            if main.allowed_file(file_name) or extension in TEXT_EXTENSIONS:
+                found.append(os.path.relpath(os.path.join(dir_path, file_name), input_dir))
+    return sorted(found)
+
+
+def is_done(source, result_path):
+    return os.path.exists(result_path) and os.path.getmtime(result_path) >= os.path.getmtime(source)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_srt(content):
+    """Subtitle cues as TranscriptSegments"""
+    segments = []
+    for block in re.split(r'\n\s*\n', content.replace('\r\n', '\n')):
+        lines = block.strip().split('\n')
+        for i, line in enumerate(lines):
+            match = SRT_TIME_PATTERN.search(line)
+            if match:
+                values = [int(value) for value in match.groups()]
+                start = values[0] * 3600 + values[1] * 60 + values[2] + values[3] / 1000
+                end = values[4] * 3600 + values[5] * 60 + values[6] + values[7] / 1000
+                text = ' '.join(SRT_TAG_PATTERN.sub('', text_line).strip() for text_line in lines[i + 1:])
+                if text.strip():
+                    segments.append(main.TranscriptSegment(start, end, ' ' + text.strip()))
+                break
+    return segments
+
+
+def translate_file(source):
+    """Translate one input; returns (result dict, seconds of audio or None), result None if there is no text"""
+    extension = os.path.splitext(source)[1].lower()
+    lexicon_view = main.sign_lexicon.current()
+    if extension in TEXT_EXTENSIONS:
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            content = f.read()
+        if extension == '.srt':
+            segments = parse_srt(content)
+            text = ' '.join(segment.text.strip() for segment in segments)
+            # One translation per cue, shared by the glosses and the timeline
+            translation, timeline = main.translate_segments(text, segments, lexicon_view)
+        else:
+            text = ' '.join(content.split())
+            translation = main.translate(text, lexicon_view) if text else None
+            timeline = []
+        duration = None
+    else:
+        text, translation, timeline = main.process_media(source, media_hash=file_sha256(source))
+        duration = main.media_duration(source)
+
+    if not text:
+        return None, duration
+    result = dict(translation.to_dict(), timeline=timeline,
+                  glosses=main.translation_glosses(translation, lexicon_view))
+    return result, duration
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class Progress:
+    """Counts finished files and prints a line per file with running throughput"""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.signs = 0
+        self.audio_seconds = 0.0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def finish(self, path, seconds, result=None, duration=None, error=None):
+        with self._lock:
+            if error is not None:
+                self.failed += 1
+            else:
+                self.done += 1
+                self.signs += len(result['glosses'])
+                self.audio_seconds += duration or 0.0
+            finished = self.done + self.failed
+            elapsed = time.monotonic() - self.started
+            detail = f"failed: {error}" if error is not None else f"{len(result['glosses'])} signs"
+            print(f"[{finished}/{self.total}] {path}: {detail} in {seconds:.1f}s "
+                  f"({finished / elapsed * 60:.1f} files/min)", flush=True)
+
+    def summary(self, skipped):
+        elapsed = time.monotonic() - self.started
+        line = (f"{self.done} translated, {skipped} already done, {self.failed} failed in {elapsed:.1f}s; "
+                f"{self.signs} signs")
+        if self.audio_seconds:
+            line += f", {self.audio_seconds / 60:.1f} min of audio at {self.audio_seconds / elapsed:.1f}x real time"
+        return line
+
+
+def load_models(workers, needs_whisper):
+    """NLP backend, plus a Whisper pool with a slot per worker when there is media"""
+    nlp = main.load_nlp_backend()
+    whisper = None
+    if needs_whisper:
+        config = main.WHISPER_CONFIG
+        config = replace(config, num_workers=workers,
+                         cpu_threads=config.cpu_threads or max(1, (os.cpu_count() or 1) // workers))
+        whisper = main.WhisperPool(config)
+    main.models.install(nlp, whisper)
+
+
+def run(input_dir, output_dir, workers, force=False):
+    """Translate everything not done yet; returns the number of failures"""
+    paths = input_files(input_dir)
+    pending = []
+    for path in paths:
+        result_path = os.path.join(output_dir, path + RESULT_SUFFIX)
+        if force or not is_done(os.path.join(input_dir, path), result_path):
+            pending.append(path)
+    skipped = len(paths) - len(pending)
+    print(f"{len(paths)} files in {input_dir}: {len(pending)} to translate, {skipped} already done", flush=True)
+    if not pending:
+        return 0
+
+    load_models(workers, any(main.allowed_file(path) for path in pending))
+    progress = Progress(len(pending))
+
+    def work(path):
+        started = time.monotonic()
+        try:
+            result, duration = translate_file(os.path.join(input_dir, path))
+            if result is None:
+                raise ValueError('no text')
+            bundle_path = os.path.join(output_dir, path + BUNDLE_SUFFIX)
+            write_atomic(bundle_path, main.build_sigml_bundle(result['glosses']).encode('utf-8'))
+            result.update(source=path, bundle=os.path.basename(bundle_path))
+            # Written last: its presence marks the file as done
+            write_atomic(os.path.join(output_dir, path + RESULT_SUFFIX),
+                         json.dumps(result, ensure_ascii=False, indent=1).encode('utf-8'))
+        except Exception as e:
+            progress.finish(path, time.monotonic() - started, error=e)
+            return
+        progress.finish(path, time.monotonic() - started, result, duration)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(work, pending))
+    print(progress.summary(skipped), flush=True)
+    return progress.failed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help='files translated at once (default: CPU count, at most 4)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='processes per long media file (default 1: files are the unit of parallelism)')
+    parser.add_argument('--force', action='store_true', help='translate files that are already done again')
+    args = parser.parse_args()
+
+    # Per-sentence logging would bury the progress lines
+    logging.getLogger().setLevel(logging.WARNING)
+    main.chunked_transcriber = main.ChunkedTranscriber(processes=args.processes)
+    try:
+        failed = run(args.input_dir, args.output_dir, args.workers, force=args.force)
+    finally:
+        main.chunked_transcriber.shutdown()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,68 @@
+"""Measure how chunked transcription scales with the number of processes.
+
+Transcribes one media file with a single WhisperModel call, then with the
+chunked process pool at each requested size, and reports wall-clock time,
+real-time factor (processing time / audio duration) and speedup.
+
+    python benchmarks/chunked_transcription.py MEDIA [--processes 2,4,8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def time_sequential(media_path):
+    model = main.load_whisper_model()
+    start = time.perf_counter()
+    segments, info = model.transcribe(media_path, **main.WHISPER_TRANSCRIBE_OPTIONS)
+    count = len(list(segments))
+    return time.perf_counter() - start, info.duration, count
+
+
+def time_chunked(media_path, processes):
+    transcriber = main.ChunkedTranscriber(processes=processes, min_seconds=0)
+    try:
+        # Load the model in every process first so loading is not timed
+        silence = np.zeros(main.AUDIO_SAMPLE_RATE, dtype=np.float32)
+        executor = transcriber.executor()
+        for future in [executor.submit(main._transcribe_chunk, silence, 0, 0, 1) for _ in range(processes)]:
+            future.result()
+        start = time.perf_counter()
+        segments, info = transcriber.transcribe(media_path)
+        count = len(list(segments))
+        return time.perf_counter() - start, info.duration, count
+    finally:
+        transcriber.shutdown()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('media')
+    parser.add_argument('--processes', default='2,4',
+                        help='comma-separated pool sizes to try (default: 2,4)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    elapsed, duration, count = time_sequential(args.media)
+    baseline = elapsed
+    print(f"audio: {duration:.0f}s")
+    print(f"sequential: {elapsed:.1f}s  RTF {elapsed / duration:.3f}  {count} segments")
+
+    for processes in [int(value) for value in args.processes.split(',')]:
+        elapsed, duration, count = time_chunked(args.media, processes)
+        print(f"{processes} processes: {elapsed:.1f}s  RTF {elapsed / duration:.3f}  "
+              f"speedup {baseline / elapsed:.2f}x  {count} segments")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,146 @@
+"""Measure how server throughput scales with the number of worker processes.
+
+For each --workers count, starts serve.py, waits until it translates, then
+sends --requests POSTs to /api/translate (one corpus sentence each) from
+--concurrency keep-alive clients and reports requests per second, latency
+percentiles and the speedup over the first count. The translation cache is
+disabled in the server so every request runs the full text-to-ISL pipeline.
+
+    python benchmarks/load_test.py [--workers 1,2,4] [--concurrency 16] [--requests 2000]
+    python benchmarks/load_test.py --url http://localhost:8000  # a server that is already running
+
+Throughput only scales while there are free cores; run it on the machine
+you deploy to.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+STARTUP_TIMEOUT_SECONDS = 300
+
+
+def load_corpus(name):
+    with open(os.path.join(CORPUS_DIR, f'{name}.txt'), 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def start_server(workers, threads, port):
+    env = dict(os.environ, ISL_TRANSLATION_CACHE_SIZE='0')
+    return subprocess.Popen(
+        [sys.executable, os.path.join(REPO_DIR, 'serve.py'), '--workers', str(workers),
+         '--threads', str(threads), '--bind', f'127.0.0.1:{port}'],
+        cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def wait_until_translating(url, process=None):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {process.returncode}")
+        try:
+            if httpx.post(f'{url}/api/translate', json={'text': 'Hello'}, timeout=5).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not start translating within {STARTUP_TIMEOUT_SECONDS}s")
+
+
+def run_load(url, sentences, requests, concurrency):
+    """Send the requests from concurrency clients; returns (elapsed seconds, sorted latencies, errors)"""
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def client():
+        with httpx.Client(base_url=url, timeout=60) as session:
+            while True:
+                i = next(counter)
+                if i >= requests:
+                    return
+                start = time.perf_counter()
+                try:
+                    response = session.post('/api/translate', json={'texts': [sentences[i % len(sentences)]]})
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    (latencies if ok else errors).append(elapsed)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return time.perf_counter() - start, sorted(latencies), len(errors)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default='1,2,4', help='comma-separated worker counts to try')
+    parser.add_argument('--threads', type=int, default=8, help='threads per worker')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent client connections')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--corpus', default='lecture', help='sentences to send, from benchmarks/corpus')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', help='load an already running server instead of starting serve.py')
+    args = parser.parse_args()
+
+    sentences = load_corpus(args.corpus)
+    if args.url:
+        runs = [(None, args.url.rstrip('/'))]
+    else:
+        runs = [(int(workers), f'http://127.0.0.1:{args.port}') for workers in args.workers.split(',')]
+
+    print(f"{'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'speedup':>7}")
+    baseline = None
+    for workers, url in runs:
+        process = start_server(workers, args.threads, args.port) if workers is not None else None
+        try:
+            wait_until_translating(url, process)
+            # Warm up every connection path before timing
+            run_load(url, sentences, args.concurrency * 4, args.concurrency)
+            elapsed, latencies, errors = run_load(url, sentences, args.requests, args.concurrency)
+        finally:
+            if process is not None:
+                stop_server(process)
+
+        throughput = len(latencies) / elapsed
+        baseline = baseline or throughput
+        label = workers if workers is not None else '-'
+        print(f"{label:>7} {throughput:>8.1f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.95) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+              f"{errors:>6} {throughput / baseline:>6.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,252 @@
+"""Time each stage of the text-to-ISL pipeline and compare against a baseline.
+
+Stages are timed separately on realistic corpora (benchmarks/corpus) and on
+seeded synthetic sentences, each cut or cycled to several sizes. The
+end-to-end stage posts media to /upload with a stub Whisper model, so it
+measures everything except speech recognition.
+
+    python benchmarks/pipeline.py [--sizes 10,100,1000] [--repeat 5]
+    python benchmarks/pipeline.py --output results.json
+    python benchmarks/pipeline.py --compare benchmarks/baselines/pipeline.json [--tolerance 0.25]
+    python benchmarks/pipeline.py --save-baseline
+
+Results are JSON keyed by "<corpus>/<size>/<stage>" with the best time per
+item over --repeat passes. --compare exits with status 1 when any stage is
+slower than the baseline by more than --tolerance (a fraction). Baselines
+are machine-specific; regenerate them on the machine you compare on.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, 'corpus')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baselines', 'pipeline.json')
+REALISTIC_CORPORA = ['phrases', 'lecture']
+# Synthetic corpora: name -> words per sentence
+SYNTHETIC_CORPORA = {'synthetic-short': 5, 'synthetic-long': 40}
+
+
+class StubWhisper:
+    """Stands in for the Whisper pool: returns a fixed transcript instantly"""
+
+    def __init__(self, sentences):
+        self.sentences = sentences
+
+    def transcribe(self, audio, **options):
+        segments = [main.TranscriptSegment(i * 2.0, i * 2.0 + 2.0, ' ' + sentence)
+                    for i, sentence in enumerate(self.sentences)]
+        return iter(segments), main.TranscriptInfo(duration=len(segments) * 2.0)
+
+
+def load_corpus(name):
+    with open(os.path.join(CORPUS_DIR, f'{name}.txt'), 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def synthetic_sentences(count, length, lexicon_view, seed=1):
+    """Random sentences mixing signed words, inflected forms, stop words and unknown words"""
+    rng = random.Random(seed)
+    glosses = sorted(gloss for gloss in lexicon_view.sign_files if gloss.isalpha() and len(gloss) > 2)
+    stop_words = sorted(main.all_stop_words)
+    inflections = ['ing', 'ed', 's', 'ly', 'er']
+    question_words = ['what', 'where', 'who', 'how', 'why']
+
+    sentences = []
+    for _ in range(count):
+        words = []
+        for _ in range(length):
+            kind = rng.random()
+            if kind < 0.4:
+                words.append(rng.choice(glosses))
+            elif kind < 0.6:
+                words.append(rng.choice(glosses) + rng.choice(inflections))
+            elif kind < 0.85:
+                words.append(rng.choice(stop_words))
+            elif kind < 0.9:
+                words.append(rng.choice(question_words))
+            else:
+                words.append(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9))))
+        sentences.append(' '.join(words).capitalize() + rng.choice(['.', '?', '!', ',']))
+    return sentences
+
+
+def build_corpora(sizes, lexicon_view):
+    corpora = {}
+    for name in REALISTIC_CORPORA:
+        sentences = load_corpus(name)
+        for size in sizes:
+            # Cycle short corpora up to the requested size
+            corpora[(name, size)] = [sentences[i % len(sentences)] for i in range(size)]
+    for name, length in SYNTHETIC_CORPORA.items():
+        for size in sizes:
+            corpora[(name, size)] = synthetic_sentences(size, length, lexicon_view)
+    return corpora
+
+
+def best_time(run, repeat, before=None):
+    """Best wall-clock time of run() over repeat passes"""
+    times = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def prepare_stage_inputs(sentences, lexicon_view):
+    """Each stage's input, computed by the stages before it"""
+    cleaned = [main.remove_punctuation(text) for text in sentences]
+    words = [text.split() for text in cleaned]
+    filtered = [main.filter_and_process_words([sentence_words])[0] for sentence_words in words]
+    reordered = [main.advanced_isl_reorder(sentence_words) for sentence_words in filtered]
+    final = [main.final_output(sentence_words, lexicon_view) for sentence_words in reordered]
+    return words, filtered, reordered, final
+
+
+def time_stages(sentences, lexicon_view, repeat, client):
+    words, filtered, reordered, final = prepare_stage_inputs(sentences, lexicon_view)
+    flat_words = [word.lower() for sentence_words in words for word in sentence_words]
+
+    stages = {
+        'remove_punctuation': (len(sentences), lambda: [main.remove_punctuation(text) for text in sentences]),
+        # The lexicon normalizer (inflected word -> sign), with its memo cleared before each pass
+        'normalize': (len(flat_words), lambda: [lexicon_view.normalize(word) for word in flat_words],
+                      lexicon_view.normalize.cache_clear),
+        'filter_and_process_words': (len(words), lambda: [main.filter_and_process_words([w]) for w in words]),
+        'advanced_isl_reorder': (len(filtered), lambda: [main.advanced_isl_reorder(w) for w in filtered]),
+        'final_output': (len(reordered), lambda: [main.final_output(w, lexicon_view) for w in reordered]),
+        'map_to_sigml_files': (len(final), lambda: [main.map_to_sigml_files([w], lexicon_view) for w in final]),
+    }
+
+    results = {}
+    for stage, (items, run, *before) in stages.items():
+        results[stage] = (items, best_time(run, repeat, *before))
+
+    # The whole text path, without and with the translation cache
+    convert = lambda: [main.convert_to_isl(text) for text in sentences]  # noqa: E731
+    results['convert_to_isl'] = (len(sentences), best_time(convert, repeat, before=main.translation_cache.clear))
+    results['convert_to_isl_cached'] = (len(sentences), best_time(convert, repeat))
+
+    # /upload with the transcript of this corpus; fresh bytes each pass miss the transcript cache
+    main.models.whisper.sentences = sentences
+    upload = lambda: post_upload(client, os.urandom(4096))  # noqa: E731
+    results['upload_end_to_end'] = (1, best_time(upload, repeat, before=main.translation_cache.clear))
+    return results
+
+
+def post_upload(client, content):
+    response = client.post('/upload', data={'file': (io.BytesIO(content), 'clip.mp3')},
+                           content_type='multipart/form-data')
+    if response.status_code != 200:
+        raise RuntimeError(f"/upload returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+
+def run_benchmarks(sizes, repeat):
+    lexicon_view = main.sign_lexicon.current()
+    main.models.install(main.load_nlp_backend(), StubWhisper([]))
+    # Keep uploads and transcripts out of the working tree
+    work_dir = tempfile.mkdtemp(prefix='isl-bench-')
+    main.UPLOAD_DIR = os.path.join(work_dir, 'uploads')
+    main.transcript_cache = main.TranscriptCache(os.path.join(work_dir, 'transcripts'),
+                                                 model_identity='benchmark-stub')
+    main.chunked_transcriber = main.ChunkedTranscriber(processes=1)
+    client = main.app.test_client()
+
+    results = {}
+    for (corpus, size), sentences in build_corpora(sizes, lexicon_view).items():
+        for stage, (items, seconds) in time_stages(sentences, lexicon_view, repeat, client).items():
+            results[f'{corpus}/{size}/{stage}'] = {
+                'items': items,
+                'seconds': round(seconds, 6),
+                'us_per_item': round(seconds * 1e6 / max(items, 1), 3),
+            }
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tokenizer': main.NLP_BACKEND,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print per-stage changes against the baseline; returns the keys that regressed"""
+    regressions = []
+    print(f"{'stage':<52} {'baseline us':>12} {'now us':>12} {'change':>8}")
+    for key, result in report['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            print(f"{key:<52} {'-':>12} {result['us_per_item']:>12.2f} {'new':>8}")
+            continue
+        change = result['us_per_item'] / previous['us_per_item'] - 1 if previous['us_per_item'] else 0.0
+        flag = ''
+        if change > tolerance:
+            regressions.append(key)
+            flag = '  SLOWER'
+        print(f"{key:<52} {previous['us_per_item']:>12.2f} {result['us_per_item']:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'stage':<52} {'items':>6} {'us/item':>12}")
+    for key, result in report['results'].items():
+        print(f"{key:<52} {result['items']:>6} {result['us_per_item']:>12.2f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10,100,1000', help='comma-separated corpus sizes in sentences')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the JSON results to this file')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against a stored baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f'store the results as the baseline (default: {os.path.relpath(DEFAULT_BASELINE)})')
+    args = parser.parse_args()
+
+    # Debug prints and per-sentence logging would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        report = run_benchmarks([int(size) for size in args.sizes.split(',')], args.repeat)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than the baseline by more than {args.tolerance:.0%}")
+            return 1
+        print("No regressions")
+        return 0
+
+    print_report(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
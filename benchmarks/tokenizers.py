@@ -0,0 +1,117 @@
+"""Compare the rule-based tokenizer with the Stanza pipeline.
+
+Checks that both backends give identical ISL output over a phrase corpus and
+times the full text-to-ISL conversion with each. Exits with status 1 if any
+phrase differs.
+
+    python benchmarks/tokenizers.py [--corpus FILE] [--repeat N]
+    python benchmarks/tokenizers.py --export-exceptions
+
+--export-exceptions rewrites data/tokenizer_exceptions.json from the
+installed spaCy English tokenizer exceptions.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'phrases.txt')
+
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def export_exceptions(path):
+    """Write spaCy's English exceptions for tokens that survive remove_punctuation"""
+    from spacy.attrs import ORTH
+    from spacy.lang.en import English
+
+    exceptions = {}
+    for key, pieces in English.Defaults.tokenizer_exceptions.items():
+        if not re.fullmatch(r"[\w']+", key):
+            continue
+        orths = [piece[ORTH] for piece in pieces]
+        # Single-piece entries only matter when they stop an apostrophe being split off
+        if len(orths) > 1 or "'" in key:
+            exceptions[key] = orths
+
+    # One entry per line keeps the file reviewable in diffs
+    lines = [f"{json.dumps(key)}: {json.dumps(exceptions[key])}" for key in sorted(exceptions)]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n' + ',\n'.join(lines) + '\n}\n')
+    print(f"Wrote {len(exceptions)} exceptions to {path}")
+
+
+def run_backend(nlp, phrases):
+    """Translate every phrase with the given tokenizer, bypassing the translation cache"""
+    lexicon_view = main.sign_lexicon.current()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return [main.ISLPipeline(nlp=nlp, lexicon_view=lexicon_view).run(text) for text in phrases]
+
+
+def time_backend(nlp, phrases, repeat):
+    run_backend(nlp, phrases)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run_backend(nlp, phrases)
+    return (time.perf_counter() - start) / (repeat * len(phrases))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--export-exceptions', action='store_true')
+    args = parser.parse_args()
+
+    if args.export_exceptions:
+        export_exceptions(main.TOKENIZER_EXCEPTIONS_PATH)
+        return 0
+
+    # Per-sentence reorder logging would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    phrases = load_corpus(args.corpus)
+    rules = main.RuleBasedTokenizer()
+    try:
+        load_start = time.perf_counter()
+        stanza_nlp = main.load_stanza_pipeline()
+        stanza_load = time.perf_counter() - load_start
+    except ImportError:
+        print("Stanza is not installed; install it to compare backends.")
+        return 2
+    except Exception as e:
+        # Missing resources with ISL_OFFLINE=1, or a failed download
+        print(f"Stanza resources are not available ({e}); download them to {main.STANZA_RESOURCES_DIR} "
+              f"(run once without ISL_OFFLINE=1) to compare backends.")
+        return 2
+
+    mismatches = 0
+    for text, expected, actual in zip(phrases, run_backend(stanza_nlp, phrases), run_backend(rules, phrases)):
+        if expected.isl_text != actual.isl_text:
+            mismatches += 1
+            print(f"MISMATCH: {text}")
+            print(f"  stanza: {expected.isl_text}")
+            print(f"  rules:  {actual.isl_text}")
+    print(f"{len(phrases) - mismatches}/{len(phrases)} phrases identical")
+
+    stanza_time = time_backend(stanza_nlp, phrases, args.repeat)
+    rules_time = time_backend(rules, phrases, args.repeat)
+    print(f"stanza: {stanza_time * 1000:.3f} ms/phrase (pipeline load {stanza_load:.1f}s)")
+    print(f"rules:  {rules_time * 1000:.3f} ms/phrase")
+    print(f"speedup: {stanza_time / rules_time:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,105 @@
+"""Compare Whisper engine configurations by speed and memory.
+
+Every combination of the given settings is loaded in a fresh process, which
+transcribes the media file once to warm up and then --repeat times. Reports
+load time, real-time factor (processing time / audio duration; lower is
+faster) and the process's peak resident memory.
+
+    python benchmarks/whisper_engine.py MEDIA --models small,base \\
+        --compute-types int8,float32 --threads 4 --beam-sizes 1,5 --vad 0,1
+
+With --concurrency N, N transcriptions run at once through a WhisperPool
+with num_workers=N and the RTF is measured over all of them.
+"""
+import argparse
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def split_list(value, cast=str):
+    return [cast(item) for item in value.split(',') if item]
+
+
+def run_config(config, media_path, repeat, concurrency):
+    """Benchmark one configuration; runs in its own process"""
+    logging.getLogger().setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    pool = main.WhisperPool(config)
+    load_time = time.perf_counter() - start
+
+    def transcribe_once():
+        segments, info = pool.transcribe(media_path)
+        list(segments)
+        return info.duration
+
+    duration = transcribe_once()  # warm-up
+    elapsed = 0.0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(executor.map(lambda _: transcribe_once(), range(concurrency)))
+            elapsed += time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    return {
+        'load_seconds': load_time,
+        'rtf': elapsed / (repeat * concurrency * duration),
+        'peak_rss_mb': peak_mb,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('media')
+    parser.add_argument('--models', default=main.WHISPER_MODEL_NAME)
+    parser.add_argument('--compute-types', default='int8,float32')
+    parser.add_argument('--threads', default=str(os.cpu_count() or 1))
+    parser.add_argument('--beam-sizes', default=str(main.WHISPER_BEAM_SIZE))
+    parser.add_argument('--vad', default='0', help='comma-separated 0/1 values for vad_filter')
+    parser.add_argument('--device', default=main.WHISPER_DEVICE)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    configs = [
+        replace(main.WHISPER_CONFIG, model=model, device=args.device, compute_type=compute_type,
+                cpu_threads=threads, num_workers=args.concurrency, pool_size=1,
+                beam_size=beam_size, vad_filter=bool(vad))
+        for model, compute_type, threads, beam_size, vad in itertools.product(
+            split_list(args.models), split_list(args.compute_types), split_list(args.threads, int),
+            split_list(args.beam_sizes, int), split_list(args.vad, int))
+    ]
+
+    print(f"{'model':<10} {'compute':<9} {'threads':>7} {'beam':>4} {'vad':>3} "
+          f"{'load s':>7} {'RTF':>7} {'peak MB':>8}")
+    context = multiprocessing.get_context('spawn')
+    for config in configs:
+        label = (f"{config.model:<10} {config.compute_type:<9} {config.cpu_threads:>7} "
+                 f"{config.beam_size:>4} {int(config.vad_filter):>3}")
+        # A fresh process per configuration keeps the memory figures separate
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                result = executor.submit(run_config, config, args.media, args.repeat, args.concurrency).result()
+            except Exception as e:
+                print(f"{label} failed: {e}")
+                continue
+        print(f"{label} {result['load_seconds']:>7.2f} {result['rtf']:>7.3f} {result['peak_rss_mb']:>8.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
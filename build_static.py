@@ -0,0 +1,148 @@
+"""Precompress and fingerprint the static tree for serving.
+
+Writes gzip (and brotli, when the brotli package is installed) variants of
+every compressible file in static/ to build/static (ISL_STATIC_BUILD_DIR),
+plus a manifest mapping each file to its content hash, fingerprinted name
+and variants. The server reads the manifest at startup, so rerun this and
+restart after changing static files:
+
+    python build_static.py [--output build/static] [--no-brotli]
+
+Unchanged files (same size and modification time) are reused from the
+previous build. Uploads are skipped.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import main
+
+# Text formats worth compressing; images, jars and archives already are
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.json', '.html', '.htm', '.sigml', '.xml', '.xsl', '.txt', '.svg',
+    '.properties', '.jnlp', '.frag', '.vert', '.csv', '.map',
+}
+# Variants that save less than this fraction of the original are not kept
+MIN_SAVING = 0.1
+SKIPPED_DIRS = {'uploads'}
+
+
+def fingerprinted_name(path, digest):
+    """'js/script.js' -> 'js/script.1a2b3c4d.js'"""
+    root, extension = os.path.splitext(path)
+    return f"{root}.{digest[:8]}{extension}"
+
+
+def compressors(use_brotli):
+    encoders = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if use_brotli:
+        try:
+            import brotli
+        except ImportError:
+            logging.warning("brotli is not installed, writing gzip variants only (pip install brotli)")
+        else:
+            encoders['br'] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+def static_files(static_dir):
+    for dir_path, dir_names, file_names in os.walk(static_dir):
+        if dir_path == static_dir:
+            dir_names[:] = [name for name in dir_names if name not in SKIPPED_DIRS]
+        dir_names[:] = [name for name in dir_names if not name.startswith('.')]
+        for file_name in file_names:
+            if not file_name.startswith('.'):
+                path = os.path.join(dir_path, file_name)
+                yield os.path.relpath(path, static_dir).replace(os.sep, '/')
+
+
+def load_previous(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest['files'] if manifest.get('format') == main.STATIC_MANIFEST_FORMAT else {}
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.part'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build(static_dir, output_dir, use_brotli=True):
+    """Build every variant and the manifest; returns (files, reused, bytes before, bytes after gzip)"""
+    manifest_path = os.path.join(output_dir, main.STATIC_MANIFEST_NAME)
+    previous = load_previous(manifest_path)
+    encoders = compressors(use_brotli)
+
+    files = {}
+    reused = 0
+    for path in sorted(static_files(static_dir)):
+        source = os.path.join(static_dir, path)
+        stat = os.stat(source)
+        entry = previous.get(path)
+        if (entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                and set(entry['encodings']) <= set(encoders)
+                and all(os.path.exists(os.path.join(output_dir, path + main.STATIC_ENCODINGS[encoding]))
+                        for encoding in entry['encodings'])):
+            files[path] = entry
+            reused += 1
+            continue
+
+        with open(source, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        encodings = []
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            for encoding, compress in encoders.items():
+                compressed = compress(data)
+                if len(compressed) <= len(data) * (1 - MIN_SAVING):
+                    write_atomic(os.path.join(output_dir, path + main.STATIC_ENCODINGS[encoding]), compressed)
+                    encodings.append(encoding)
+        files[path] = {
+            'hash': digest,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'fingerprinted': fingerprinted_name(path, digest),
+            'encodings': encodings,
+        }
+
+    # Variants of files that were removed or no longer compress are stale
+    wanted = {path + main.STATIC_ENCODINGS[encoding] for path, entry in files.items() for encoding in entry['encodings']}
+    for dir_path, _, file_names in os.walk(output_dir):
+        for file_name in file_names:
+            variant = os.path.relpath(os.path.join(dir_path, file_name), output_dir).replace(os.sep, '/')
+            if variant != main.STATIC_MANIFEST_NAME and variant not in wanted:
+                os.remove(os.path.join(dir_path, file_name))
+
+    manifest = {'format': main.STATIC_MANIFEST_FORMAT, 'files': files}
+    write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+    total = sum(entry['size'] for entry in files.values())
+    gzipped = sum(os.path.getsize(os.path.join(output_dir, path + '.gz')) if 'gzip' in entry['encodings']
+                  else entry['size'] for path, entry in files.items())
+    return len(files), reused, total, gzipped
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--static-dir', default=main.STATIC_DIR)
+    parser.add_argument('--output', default=main.STATIC_BUILD_DIR)
+    parser.add_argument('--no-brotli', action='store_true', help='write gzip variants only')
+    args = parser.parse_args()
+
+    count, reused, total, gzipped = build(args.static_dir, args.output, use_brotli=not args.no_brotli)
+    print(f"{count} files ({reused} unchanged), {total / 1e6:.1f} MB -> {gzipped / 1e6:.1f} MB with gzip, "
+          f"manifest in {os.path.join(args.output, main.STATIC_MANIFEST_NAME)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
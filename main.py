@@ -8,43 +8,556 @@ os.environ["STANZA_USE_TOKENIZER"] = "spacy"
 # =========================
 
 # Now import the rest
-from flask import Flask, request, jsonify, render_template, send_from_directory
-from faster_whisper import WhisperModel
-import stanza
+from flask import Flask, Request, Response, g, request, jsonify, render_template, send_file, send_from_directory
 import logging
 from flask import url_for
 import uuid
-from datetime import datetime
 import zipfile
 import sys
 import time
 import ssl
 import pprint
 import re
+import threading
+import queue
+import itertools
+import json
+import hashlib
+import functools
+import gzip
+import tempfile
+import bisect
+import io
+import mimetypes
+import concurrent.futures
+import multiprocessing
+from collections import namedtuple, OrderedDict
+from dataclasses import dataclass, replace
+from urllib.parse import quote
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from flask_sock import Sock
 
 
 ssl._create_default_https_context = ssl._create_unverified_context
 
-app = Flask(__name__)
+# Static files are served by serve_static (below) rather than Flask's built-in route
+app = Flask(__name__, static_folder=None, static_url_path='/static')
+sock = Sock(app)
+
+# Used to report cold-start time once the models are ready
+STARTUP_BEGAN = time.monotonic()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
 # Directory settings
 BASE_PATH = os.path.dirname(os.path.realpath(__file__))
-SIGN_FILES_DIR = os.path.join(BASE_PATH, 'static', 'SignFiles')
-UPLOAD_DIR = os.path.join(BASE_PATH, 'static', 'uploads')
+STATIC_DIR = os.path.join(BASE_PATH, 'static')
+SIGN_FILES_DIR = os.path.join(STATIC_DIR, 'SignFiles')
+UPLOAD_DIR = os.path.join(STATIC_DIR, 'uploads')
+WORDS_FILE_PATH = os.path.join(BASE_PATH, 'words.txt')
+
+# How often (seconds) the sign lexicon checks SignFiles for changes
+LEXICON_REFRESH_SECONDS = float(os.environ.get('ISL_LEXICON_REFRESH_SECONDS', '5'))
+
+# Whisper inference engine (loaded in the background, see ModelStore)
+WHISPER_MODEL_NAME = os.environ.get('ISL_WHISPER_MODEL', 'small')
+# 'default' keeps the model's stored precision; 'int8' is usually fastest on CPU
+WHISPER_COMPUTE_TYPE = os.environ.get('ISL_WHISPER_COMPUTE_TYPE', 'default')
+WHISPER_DEVICE = os.environ.get('ISL_WHISPER_DEVICE', 'auto')
+# 0 lets CTranslate2 pick the thread count
+WHISPER_CPU_THREADS = int(os.environ.get('ISL_WHISPER_CPU_THREADS', '0'))
+# Concurrent transcriptions per model instance (they share the weights)
+WHISPER_NUM_WORKERS = int(os.environ.get('ISL_WHISPER_NUM_WORKERS', '1'))
+# Independent model instances; each holds its own copy of the weights
+WHISPER_POOL_SIZE = int(os.environ.get('ISL_WHISPER_POOL_SIZE', '1'))
+WHISPER_BEAM_SIZE = int(os.environ.get('ISL_WHISPER_BEAM_SIZE', '5'))
+WHISPER_VAD_FILTER = os.environ.get('ISL_WHISPER_VAD_FILTER', '0') == '1'
+# Word timings place the sign timeline on the spoken words rather than whole segments,
+# at the cost of an alignment pass per segment
+WHISPER_WORD_TIMESTAMPS = os.environ.get('ISL_WHISPER_WORD_TIMESTAMPS', '0') == '1'
+
+# Model locations: models are loaded from these directories first and only
+# downloaded when missing (never, if ISL_OFFLINE=1)
+MODEL_DIR = os.environ.get('ISL_MODEL_DIR', os.path.join(BASE_PATH, 'models'))
+STANZA_RESOURCES_DIR = os.environ.get('ISL_STANZA_RESOURCES_DIR', os.path.join(BASE_PATH, 'stanza_resources'))
+MODELS_OFFLINE = os.environ.get('ISL_OFFLINE', '0') == '1'
+# How long a request waits for models that are still loading before a 503
+MODEL_WAIT_SECONDS = float(os.environ.get('ISL_MODEL_WAIT_SECONDS', '300'))
+# How long /upload waits for a free Whisper slot before a 503; queued jobs wait as long as it takes
+WHISPER_BUSY_WAIT_SECONDS = float(os.environ.get('ISL_WHISPER_BUSY_WAIT_SECONDS', '30'))
+
+# Tokenization backend: 'rules' (fast, default) or 'stanza' (full NLP annotations)
+NLP_BACKEND = os.environ.get('ISL_TOKENIZER', 'rules').lower()
+
+# Rule-based tokenizer: produces the same sentence/word texts the Stanza
+# pipeline (spaCy tokenizer) gives for the cleaned pipeline input, which is
+# all ISLPipeline reads from it
+TokenizedDocument = namedtuple('TokenizedDocument', ['sentences'])
+TokenizedSentence = namedtuple('TokenizedSentence', ['text', 'words'])
+Token = namedtuple('Token', ['text'])
+
+# spaCy's English tokenizer exceptions for apostrophe/alphanumeric tokens
+# ("can't" -> "ca", "n't"); regenerate with benchmarks/tokenizers.py --export-exceptions
+TOKENIZER_EXCEPTIONS_PATH = os.path.join(BASE_PATH, 'data', 'tokenizer_exceptions.json')
+SENTENCE_PATTERN = re.compile(r'[^.!?]*[.!?]+|[^.!?]+$')
+# Suffixes spaCy splits off tokens that survive remove_punctuation
+TOKEN_SUFFIX_PATTERN = re.compile(
+    r"(?:''|'s|'S|')$"
+    r"|(?<=[0-9])(?:km|m|dm|cm|mm|ha|nm|yd|in|ft|kg|g|mg|t|lb|oz|kmh|mph|hPa|Pa|mbar|mb|MB|kb|KB|gb|GB|tb|TB|T|G|M|K)$"
+)
+
+class RuleBasedTokenizer:
+    """Regex sentence and word splitter used in place of the Stanza pipeline"""
+
+    def __init__(self, exceptions_path=TOKENIZER_EXCEPTIONS_PATH):
+        with open(exceptions_path, 'r', encoding='utf-8') as f:
+            self.exceptions = {key: tuple(Token(piece) for piece in pieces)
+                               for key, pieces in json.load(f).items()}
+
+    def __call__(self, text):
+        sentences = []
+        for match in SENTENCE_PATTERN.finditer(text):
+            sentence_text = match.group(0).strip()
+            if sentence_text:
+                sentences.append(TokenizedSentence(sentence_text, self.tokenize(sentence_text)))
+        return TokenizedDocument(sentences)
+
+    def tokenize(self, sentence_text):
+        words = []
+        for chunk in sentence_text.split():
+            words.extend(self.split_chunk(chunk))
+        return words
+
+    def split_chunk(self, chunk):
+        """Split one whitespace-delimited chunk the way spaCy's tokenizer does"""
+        prefixes = []
+        suffixes = []
+        while chunk:
+            special = self.exceptions.get(chunk)
+            if special is not None:
+                return prefixes + list(special) + suffixes
+            if len(chunk) > 2 and chunk.startswith("''"):
+                prefixes.append(Token("''"))
+                chunk = chunk[2:]
+                continue
+            if len(chunk) > 1 and chunk[0] in "'.!?":
+                prefixes.append(Token(chunk[0]))
+                chunk = chunk[1:]
+                continue
+            if len(chunk) > 1 and chunk[-1] in '.!?':
+                suffixes.insert(0, Token(chunk[-1]))
+                chunk = chunk[:-1]
+                continue
+            match = TOKEN_SUFFIX_PATTERN.search(chunk)
+            if match and match.start() > 0:
+                suffixes.insert(0, Token(match.group(0)))
+                chunk = chunk[:match.start()]
+                continue
+            break
+        return prefixes + [Token(chunk)] + suffixes
+
+def load_stanza_pipeline():
+    # Imported here so the default rule-based backend never loads Stanza
+    import stanza
+
+    if not os.path.exists(os.path.join(STANZA_RESOURCES_DIR, 'resources.json')):
+        if MODELS_OFFLINE:
+            raise RuntimeError(f"Stanza resources not found in {STANZA_RESOURCES_DIR}")
+        stanza.download('en', model_dir=STANZA_RESOURCES_DIR)
+
+    download_method = None if MODELS_OFFLINE else stanza.DownloadMethod.REUSE_RESOURCES
+    return stanza.Pipeline('en', dir=STANZA_RESOURCES_DIR, processors={'tokenize': 'spacy'},
+                           download_method=download_method)
+
+def load_nlp_backend(backend=NLP_BACKEND):
+    if backend == 'stanza':
+        return load_stanza_pipeline()
+    if backend != 'rules':
+        logging.warning(f"Unknown tokenizer backend '{backend}', using rule-based tokenizer")
+    return RuleBasedTokenizer()
+
+@dataclass(frozen=True)
+class WhisperConfig:
+    """Model and decoding settings for the Whisper engine"""
+    model: str = WHISPER_MODEL_NAME
+    device: str = WHISPER_DEVICE
+    compute_type: str = WHISPER_COMPUTE_TYPE
+    cpu_threads: int = WHISPER_CPU_THREADS
+    num_workers: int = WHISPER_NUM_WORKERS
+    pool_size: int = WHISPER_POOL_SIZE
+    beam_size: int = WHISPER_BEAM_SIZE
+    vad_filter: bool = WHISPER_VAD_FILTER
+    word_timestamps: bool = WHISPER_WORD_TIMESTAMPS
+
+    @property
+    def transcribe_options(self):
+        options = {'beam_size': self.beam_size, 'vad_filter': self.vad_filter}
+        # Only when on, so transcripts cached without word timings keep their identity
+        if self.word_timestamps:
+            options['word_timestamps'] = True
+        return options
+
+    @property
+    def identity(self):
+        """Settings that change the transcript (threads and pool sizes do not)"""
+        options = json.dumps(self.transcribe_options, sort_keys=True)
+        return f"faster-whisper:{self.model}:{self.compute_type}:{options}"
+
+WHISPER_CONFIG = WhisperConfig()
+WHISPER_TRANSCRIBE_OPTIONS = WHISPER_CONFIG.transcribe_options
+
+def load_whisper_model(config=WHISPER_CONFIG):
+    from faster_whisper import WhisperModel
+
+    settings = dict(device=config.device, compute_type=config.compute_type,
+                    cpu_threads=config.cpu_threads, num_workers=config.num_workers)
+
+    # A converted model copied to ISL_MODEL_DIR/<name> is used as-is
+    local_path = os.path.join(MODEL_DIR, config.model)
+    if os.path.isdir(local_path):
+        return WhisperModel(local_path, **settings)
+
+    try:
+        return WhisperModel(config.model, download_root=MODEL_DIR, local_files_only=True, **settings)
+    except Exception:
+        if MODELS_OFFLINE:
+            raise
+        logging.info(f"Whisper model '{config.model}' not found in {MODEL_DIR}, downloading")
+        return WhisperModel(config.model, download_root=MODEL_DIR, **settings)
+
+class PooledSegments:
+    """Segment iterator that hands its model back to the pool once exhausted or dropped"""
+
+    def __init__(self, segments, release):
+        self._segments = segments
+        self._release = release
 
-# Load Whisper model for transcription
-model = WhisperModel("small")
+    def __iter__(self):
+        return self
 
-# Set up Stanza
-stanza.download('en', model_dir='stanza_resources')
-en_nlp = stanza.Pipeline('en', processors={'tokenize': 'spacy'})
+    def __next__(self):
+        try:
+            return next(self._segments)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    __del__ = close
+
+class WhisperPool:
+    """Whisper model instances shared by all requests with bounded concurrency.
+
+    pool_size instances are loaded; each accepts num_workers transcriptions
+    at once, so at most pool_size * num_workers run in parallel and further
+    callers wait for a free slot. live_slots more workers are added to the
+    instances and kept for live callers, so uploads cannot take them.
+    """
+
+    def __init__(self, config=WHISPER_CONFIG, live_slots=0):
+        self.config = config
+        loaded = replace(config, num_workers=config.num_workers + live_slots)
+        self.instances = [load_whisper_model(loaded) for _ in range(config.pool_size)]
+        self._slots = queue.Queue()
+        for _ in range(config.num_workers):
+            for model in self.instances:
+                self._slots.put(model)
+        self._live_slots = queue.Queue()
+        for i in range(live_slots):
+            self._live_slots.put(self.instances[i % len(self.instances)])
+        self.live_capacity = live_slots
+
+    @property
+    def capacity(self):
+        return len(self.instances) * self.config.num_workers
+
+    @property
+    def available(self):
+        return self._slots.qsize()
+
+    def transcribe(self, audio, timeout=None, live=False, **options):
+        """Like WhisperModel.transcribe; the slot is held until the segments are consumed.
+
+        Waits up to timeout seconds for a free slot (without limit if None).
+        Live callers use the live slots when the pool has any.
+        """
+        slots = self._live_slots if live and self.live_capacity else self._slots
+        try:
+            model = slots.get(timeout=timeout)
+        except queue.Empty:
+            raise WhisperBusy('All Whisper instances are busy')
+        try:
+            segments, info = model.transcribe(audio, **dict(self.config.transcribe_options, **options))
+        except BaseException:
+            slots.put(model)
+            raise
+        return PooledSegments(segments, lambda: slots.put(model)), info
+
+class ModelsNotReady(Exception):
+    """Raised when models are still loading after MODEL_WAIT_SECONDS, or failed to load"""
+
+class WhisperBusy(Exception):
+    """Raised when no Whisper slot frees up within the caller's wait"""
+
+class ModelStore:
+    """Loads the NLP backend and Whisper once, in a background thread.
+
+    The NLP backend is loaded first so text translation is available while
+    Whisper is still loading. The store reports ready only after a warm-up
+    inference has run through both models.
+    """
+
+    def __init__(self):
+        self.nlp = None
+        self.whisper = None
+        self.status = 'not_started'
+        self.error = None
+        # Load errors per component ('nlp', 'whisper'), so a failed Whisper does not block text translation
+        self.errors = {}
+        self.timings = {}
+        self._nlp_ready = threading.Event()
+        self._whisper_ready = threading.Event()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        """Start loading in the background; safe to call more than once"""
+        with self._lock:
+            if self._thread is None and self.status == 'not_started':
+                self.status = 'loading'
+                self._thread = threading.Thread(target=self._load, name='model-loader', daemon=True)
+                self._thread.start()
+
+    def preload(self):
+        """Load and warm up the NLP backend in the calling thread.
+
+        serve.py calls this before forking workers so they share the loaded
+        model; Whisper is left to start(), in each worker.
+        """
+        with self._lock:
+            if self.nlp is not None:
+                return
+            started = time.monotonic()
+            self.nlp = load_nlp_backend()
+            ISLPipeline(nlp=self.nlp).run("Hello, how are you?")
+            self.timings['nlp_load'] = time.monotonic() - started
+            self._nlp_ready.set()
+
+    def install(self, nlp, whisper):
+        """Use already-loaded models instead of loading them (benchmarks, embedding)"""
+        with self._lock:
+            self.nlp = nlp
+            self.whisper = whisper
+            self.status = 'ready'
+            self._nlp_ready.set()
+            self._whisper_ready.set()
+            self._ready.set()
+
+    def get_nlp(self, timeout=MODEL_WAIT_SECONDS):
+        return self._wait(self._nlp_ready, 'nlp', timeout).nlp
+
+    def get_whisper(self, timeout=MODEL_WAIT_SECONDS):
+        return self._wait(self._whisper_ready, 'whisper', timeout).whisper
+
+    def _wait(self, event, component, timeout):
+        self.start()
+        if not event.wait(timeout):
+            raise ModelsNotReady('Models are still loading')
+        if component in self.errors:
+            raise ModelsNotReady(self.errors[component])
+        return self
+
+    def _load(self):
+        started = time.monotonic()
+        # Already there when preloaded before forking
+        if self.nlp is None:
+            try:
+                self.nlp = load_nlp_backend()
+            except Exception as e:
+                # Transcripts could not be translated either
+                self._fail(e, 'nlp', 'whisper')
+                return
+            self.timings['nlp_load'] = time.monotonic() - started
+            self._nlp_ready.set()
+
+        try:
+            step = time.monotonic()
+            # Live sessions get slots of their own unless they have a separate model
+            self.whisper = WhisperPool(live_slots=0 if LIVE_WHISPER_MODEL else LIVE_WHISPER_SLOTS)
+            self.timings['whisper_load'] = time.monotonic() - step
+            self._whisper_ready.set()
+
+            step = time.monotonic()
+            self._warm_up()
+            self.timings['warm_up'] = time.monotonic() - step
+        except Exception as e:
+            self._fail(e, 'whisper')
+            return
+
+        self.timings['total'] = time.monotonic() - started
+        self.status = 'ready'
+        self._ready.set()
+        logging.info(
+            f"Models ready in {self.timings['total']:.2f}s "
+            f"(nlp {self.timings['nlp_load']:.2f}s, whisper {self.timings['whisper_load']:.2f}s, "
+            f"warm-up {self.timings['warm_up']:.2f}s); cold start {time.monotonic() - STARTUP_BEGAN:.2f}s"
+        )
+
+    def _fail(self, error, *components):
+        logging.error(f"Error loading models: {error}")
+        self.error = str(error)
+        self.status = 'failed'
+        for component in components:
+            self.errors[component] = str(error)
+        # Wake up waiting requests so they fail fast
+        self._nlp_ready.set()
+        self._whisper_ready.set()
+
+    def _warm_up(self):
+        import numpy as np
+
+        # One second of silence through Whisper and a short sentence through the NLP stack
+        segments, _ = self.whisper.transcribe(np.zeros(16000, dtype=np.float32))
+        list(segments)
+        ISLPipeline(nlp=self.nlp).run("Hello, how are you?")
+
+models = ModelStore()
+
+# Background transcription jobs
+JOB_WORKERS = int(os.environ.get('ISL_JOB_WORKERS', '2'))
+JOB_QUEUE_MAX = int(os.environ.get('ISL_JOB_QUEUE_MAX', '16'))
+JOB_RETRY_AFTER_SECONDS = int(os.environ.get('ISL_JOB_RETRY_AFTER_SECONDS', '30'))
+JOB_TTL_SECONDS = int(os.environ.get('ISL_JOB_TTL_SECONDS', '3600'))
+# Rough processing rate used to let short clips overtake long ones in the queue
+JOB_PRIORITY_BYTES_PER_SECOND = int(os.environ.get('ISL_JOB_PRIORITY_BYTES_PER_SECOND', str(1024 * 1024)))
+JOB_EVENT_KEEPALIVE_SECONDS = 15
+# Job state shared by server processes (serve.py sets this when it runs several
+# workers); empty keeps each job in the memory of the process that accepted it
+JOB_STATE_DIR = os.environ.get('ISL_JOB_STATE_DIR', '')
+# How often a process checks on a job that another process is running
+JOB_STATE_POLL_SECONDS = 0.5
+
+# Long media is split at silences into chunks transcribed in parallel by a
+# pool of processes, each holding its own WhisperModel
+LONG_MEDIA_SECONDS = float(os.environ.get('ISL_LONG_MEDIA_SECONDS', '600'))
+TRANSCRIBE_PROCESSES = int(os.environ.get('ISL_TRANSCRIBE_PROCESSES', str(min(4, os.cpu_count() or 1))))
+CHUNK_TARGET_SECONDS = float(os.environ.get('ISL_CHUNK_SECONDS', '120'))
+# Overlap added around chunks that had to be cut mid-speech
+CHUNK_OVERLAP_SECONDS = 2.0
+AUDIO_SAMPLE_RATE = 16000
+
+# Content-addressed transcription cache
+TRANSCRIPT_CACHE_DIR = os.environ.get('ISL_TRANSCRIPT_CACHE_DIR', os.path.join(BASE_PATH, 'cache', 'transcripts'))
+TRANSCRIPT_CACHE_MAX_BYTES = int(float(os.environ.get('ISL_TRANSCRIPT_CACHE_MAX_MB', '256')) * 1024 * 1024)
+TRANSCRIPT_CACHE_MAX_AGE_SECONDS = int(float(os.environ.get('ISL_TRANSCRIPT_CACHE_MAX_AGE_DAYS', '30')) * 86400)
+# Bump when the cache entry format changes so old entries are ignored
+TRANSCRIPT_CACHE_FORMAT = 1
+# Bump when text-to-ISL conversion changes so stored ISL results are rebuilt
+# (transcripts stay valid); the reorder rules file is tracked separately
+TRANSLATION_PIPELINE_VERSION = 3
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Uploads larger than ISL_MAX_UPLOAD_MB are refused from their Content-Length
+# before any of the body is read
+MAX_UPLOAD_BYTES = int(float(os.environ.get('ISL_MAX_UPLOAD_MB', '500')) * 1024 * 1024)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+# /upload decodes requests up to this size straight from memory, without writing them to disk
+IN_MEMORY_UPLOAD_BYTES = int(float(os.environ.get('ISL_IN_MEMORY_UPLOAD_MB', '8')) * 1024 * 1024)
+# In-memory uploads kept for the media player; the oldest are written to UPLOAD_DIR beyond this
+MEMORY_MEDIA_MAX_BYTES = int(float(os.environ.get('ISL_MEMORY_MEDIA_MB', '256')) * 1024 * 1024)
+
+# Sentence-level translation cache (number of entries)
+TRANSLATION_CACHE_SIZE = int(os.environ.get('ISL_TRANSLATION_CACHE_SIZE', '4096'))
+
+# Largest number of texts accepted by one /api/translate call
+MAX_BATCH_TEXTS = int(os.environ.get('ISL_MAX_BATCH_TEXTS', '1000'))
+
+# Sign timeline: signing time estimated from each sign's HamNoSys
+SIGN_HOLD_SECONDS = 0.5
+SIGN_MOVEMENT_SECONDS = 0.35
+SIGN_MIN_SECONDS = 0.3
+SIGN_MAX_SECONDS = 3.0
+# Signs are sped up by at most this factor to finish before the next segment
+TIMELINE_MAX_SPEEDUP = 2.0
+
+# Merged SiGML bundles
+SIGML_BUNDLE_MAX_SIGNS = int(os.environ.get('ISL_SIGML_BUNDLE_MAX_SIGNS', '5000'))
+SIGML_BUNDLE_MAX_AGE_SECONDS = 300
+
+# Precompressed, fingerprinted copies of static/ written by build_static.py
+STATIC_BUILD_DIR = os.environ.get('ISL_STATIC_BUILD_DIR', os.path.join(BASE_PATH, 'build', 'static'))
+STATIC_MANIFEST_NAME = 'manifest.json'
+# Bump when the manifest format changes; older manifests are ignored
+STATIC_MANIFEST_FORMAT = 1
+# Precompressed variants in order of preference, with their file suffixes
+STATIC_ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+# Cache lifetime of static URLs without a fingerprint (sign files, unbuilt or changed files)
+STATIC_MAX_AGE_SECONDS = int(os.environ.get('ISL_STATIC_MAX_AGE_SECONDS', '300'))
+# Sign files keep plain URLs (the player and API clients read glosses from them), so
+# instead of fingerprints they get a long lifetime and revalidate by ETag afterwards
+SIGN_FILE_MAX_AGE_SECONDS = int(os.environ.get('ISL_SIGN_FILE_MAX_AGE_SECONDS', str(7 * 86400)))
+STATIC_IMMUTABLE_MAX_AGE_SECONDS = 365 * 86400
+
+# Live microphone translation (/live): the browser streams 16 kHz mono PCM over
+# a WebSocket and the audio since the last committed word is re-decoded as it grows
+LIVE_MAX_SESSIONS = int(os.environ.get('ISL_LIVE_MAX_SESSIONS', '4'))
+# Audio received between decodes; shorter is snappier but costs more CPU
+LIVE_STEP_SECONDS = float(os.environ.get('ISL_LIVE_STEP_SECONDS', '1.0'))
+# Uncommitted audio beyond this is committed even if decodes disagree
+LIVE_MAX_WINDOW_SECONDS = float(os.environ.get('ISL_LIVE_MAX_WINDOW_SECONDS', '12'))
+# Trailing silence that ends an utterance and commits all of it
+LIVE_END_SILENCE_SECONDS = 0.6
+LIVE_BEAM_SIZE = int(os.environ.get('ISL_LIVE_BEAM_SIZE', '1'))
+# A separate, usually smaller, model for live sessions; empty shares the upload model
+LIVE_WHISPER_MODEL = os.environ.get('ISL_LIVE_WHISPER_MODEL', '')
+# Workers added to the upload model for live sessions alone, when they share it
+LIVE_WHISPER_SLOTS = int(os.environ.get('ISL_LIVE_WHISPER_SLOTS', '1'))
+
+# print_lists() and per-sentence reorder logging; off by default as they run on every request
+DEBUG_DUMPS = os.environ.get('ISL_DEBUG_DUMPS', '0') == '1'
+
+# Prometheus metrics (served on /metrics)
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+MEDIA_BUCKETS = (1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+UPLOAD_SAVE_SECONDS = Histogram('isl_upload_save_seconds', 'Time to store a received upload under its hash',
+                                buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+TRANSCRIPTION_SECONDS = Histogram('isl_transcription_seconds', 'Whisper transcription time (cache misses)',
+                                  buckets=MEDIA_BUCKETS)
+AUDIO_SECONDS = Histogram('isl_transcription_audio_seconds', 'Duration of transcribed audio', buckets=MEDIA_BUCKETS)
+TRANSCRIPTION_RTF = Histogram('isl_transcription_real_time_factor', 'Transcription time / audio duration',
+                              buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4))
+NLP_SECONDS = Histogram('isl_nlp_seconds', 'Tokenization time per text', buckets=STAGE_BUCKETS)
+REORDER_SECONDS = Histogram('isl_reorder_seconds', 'Word filtering and ISL reordering time per text',
+                            buckets=STAGE_BUCKETS)
+SIGML_MAPPING_SECONDS = Histogram('isl_sigml_mapping_seconds', 'Gloss to SiGML mapping time per text',
+                                  buckets=STAGE_BUCKETS)
+WORDS_TOTAL = Counter('isl_words_total', 'ISL words by how they are signed', ['source'])
+LEXICON_WORDS = WORDS_TOTAL.labels(source='lexicon')
+FINGERSPELLED_WORDS = WORDS_TOTAL.labels(source='fingerspelled')
+# Gauges are summed over live processes when serve.py runs several workers
+REQUESTS_IN_FLIGHT = Gauge('isl_requests_in_flight', 'Requests being handled', ['endpoint'], multiprocess_mode='livesum')
+REQUEST_SECONDS = Histogram('isl_request_seconds', 'Request handling time', ['endpoint', 'method'])
+JOB_QUEUE_DEPTH = Gauge('isl_job_queue_depth', 'Transcription jobs waiting for a worker', multiprocess_mode='livesum')
+LIVE_SESSIONS = Gauge('isl_live_sessions', 'Open live translation sessions', multiprocess_mode='livesum')
+LIVE_COMMIT_LATENCY = Histogram('isl_live_commit_latency_seconds', 'Time from hearing a word to pushing its signs',
+                                buckets=(0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10))
 
 # Allowed extensions
 ALLOWED_EXTENSIONS = {'mp4', 'mov', 'mp3', 'wav', 'avi', 'mkv', 'm4a', 'aac', 'flac'}
 
+# ISL word-order rules; edit the file (and restart) to extend them without code changes
+REORDER_RULES_PATH = os.environ.get('ISL_REORDER_RULES', os.path.join(BASE_PATH, 'data', 'isl_reorder_rules.json'))
+
 # Enhanced ISL processing variables
 stop_words = set(["am","are","is","was","were","be","being","been","have","has","had",
                   "does","did","could","should","would","can","shall","will","may","might","must","let"])
@@ -59,20 +572,312 @@ important_connectors = set(["to", "and", "or", "but", "where", "we", "our"])
 # Combine stop words but exclude important connectors
 all_stop_words = stop_words.union(additional_stop_words) - important_connectors
 
-# Global processing lists
-final_words = []
-final_output_in_sent = []
-sent_list = []
-sent_list_detailed = []
-word_list = []
-word_list_detailed = []
-final_words_detailed = []
-final_words_dict = {}
+# Sign lexicon: in-memory index of the SiGML files
+
+# Characters left unescaped in sign file URLs (matches Flask's url_for)
+SIGML_URL_SAFE_CHARS = "!$&'()*+,;=:@/"
+
+def normalize_gloss(word):
+    """Normalize a word or sign file name to the gloss used as lexicon key"""
+    return word.lower().strip()
+
+# Irregular and look-alike word forms for the lexicon normalizer
+WORD_FORMS_PATH = os.path.join(BASE_PATH, 'data', 'word_forms.json')
+# Per lexicon version: memoized normalizations of the words seen
+NORMALIZER_CACHE_SIZE = int(os.environ.get('ISL_NORMALIZER_CACHE_SIZE', '65536'))
+# One-syllable consonant-vowel-consonant words double their last letter (run -> running)
+DOUBLING_PATTERN = re.compile(r'^[^aeiou]*[aeiou][bdgklmnprtvz]$')
+
+def inflected_forms(word):
+    """Regular inflections of a word: plurals and -ed, -ing, -er, -est and -ly forms"""
+    if DOUBLING_PATTERN.match(word):
+        doubled = word + word[-1]
+        forms = {word + 's', word + 'ly', doubled + 'ed', doubled + 'ing', doubled + 'er', doubled + 'est'}
+    else:
+        forms = {word + 's', word + 'ed', word + 'ing', word + 'er', word + 'est', word + 'ly'}
+    if word.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+        forms.add(word + 'es')
+    if word.endswith('e'):
+        forms.update({word + 'd', word + 'r', word + 'st', word[:-1] + 'ing'})
+        if word.endswith('ie'):
+            forms.add(word[:-2] + 'ying')
+    if word.endswith('y') and word[-2] not in 'aeiou':
+        stem = word[:-1]
+        forms.update({stem + 'ies', stem + 'ied', stem + 'ier', stem + 'iest', stem + 'ily'})
+    return forms
+
+def build_inflections(sign_files, word_forms):
+    """Map inflected forms to the sign glosses they come from"""
+    inflections = {}
+    for gloss in sign_files:
+        # Short glosses would claim common words ("he" -> "her")
+        if len(gloss) < 3 or not gloss.isalpha():
+            continue
+        for form in inflected_forms(gloss):
+            current = inflections.get(form)
+            # Prefer the longest base: "hoped" is "hope" + d, not "hop" + ed
+            if current is None or (len(gloss), gloss) > (len(current), current):
+                inflections[form] = gloss
+
+    for form, base in word_forms.get('irregular', {}).items():
+        if base in sign_files:
+            inflections[form] = base
+    for word in word_forms.get('not_inflected', []):
+        inflections.pop(word, None)
+
+    # A form with its own sign is never redirected
+    for gloss in sign_files:
+        inflections.pop(gloss, None)
+    return inflections
+
+# Sign file names made of several words ("zebra-crossing", "resting_position")
+PHRASE_GLOSS_PATTERN = re.compile(r'[a-z]+(?:[-_][a-z]+)+')
+
+# Sign elements inside a SiGML file (most use <hns_sign>, a few <hamgestural_sign>)
+SIGN_ELEMENT_PATTERN = re.compile(r'<(hns_sign|hamgestural_sign)\b.*?</\1>', re.DOTALL)
+# HamNoSys movements (and their gestural SiGML equivalents), repetitions and speed modifiers
+SIGN_MOVEMENT_PATTERN = re.compile(
+    r'<(?:ham(?:move|circle|arc|clock|stir)\w*|ham(?:replace|swinging|twisting|nodding|fingerplay|wavy|zigzag|brushing)'
+    r'|directedmotion|circularmotion|wristmotion|tgt_motion)\b')
+SIGN_REPEAT_PATTERN = re.compile(r'<(?:hamrepeat\w*|rpt_motion)\b')
+
+def estimate_sign_seconds(xml):
+    """Rough signing time of SiGML sign elements: a hold plus each movement, repeated as marked"""
+    if not xml:
+        return SIGN_MIN_SECONDS
+    movement = SIGN_MOVEMENT_SECONDS * len(SIGN_MOVEMENT_PATTERN.findall(xml))
+    for repeat in SIGN_REPEAT_PATTERN.findall(xml):
+        # "...several" repeats at least twice more
+        movement *= 3 if 'several' in repeat else 2
+    if '<hamfast' in xml:
+        movement *= 0.7
+    elif '<hamslow' in xml:
+        movement *= 1.5
+    return min(SIGN_MAX_SECONDS, max(SIGN_MIN_SECONDS, SIGN_HOLD_SECONDS + movement))
+
+class LexiconView:
+    """Immutable snapshot of the sign lexicon; all lookups are dictionary hits"""
+
+    def __init__(self, version, signature, sign_dir, sign_files, valid_words, word_forms=None):
+        self.version = version
+        self.signature = signature
+        # gloss -> file name as stored on disk (e.g. 'a' -> 'A.sigml')
+        self.sign_files = sign_files
+        # gloss -> URL served by the static route
+        self.sign_urls = {
+            gloss: f"{app.static_url_path}/SignFiles/{quote(file_name, safe=SIGML_URL_SAFE_CHARS)}"
+            for gloss, file_name in sign_files.items()
+        }
+        # Words accepted as-is even without a sign file (words.txt)
+        self.valid_words = valid_words
+        self.sign_dir = sign_dir
+        # gloss -> sign elements of its file, read once per view
+        self._sign_xml = {}
+        # gloss -> estimated signing time
+        self._sign_seconds = {}
+        # Inflected form -> gloss ("running" -> "run"), only for glosses with a sign
+        self.inflections = build_inflections(sign_files, word_forms or {})
+        self.normalize = functools.lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(self._normalize)
+        # Multi-word glosses as a trie of words; a None key marks the end of a gloss
+        self.phrase_trie = {}
+        for gloss in sign_files:
+            if PHRASE_GLOSS_PATTERN.fullmatch(gloss):
+                node = self.phrase_trie
+                for part in re.split(r'[-_]', gloss):
+                    node = node.setdefault(part, {})
+                node[None] = gloss
+
+    def sigml_file(self, word):
+        return self.sign_files.get(normalize_gloss(word))
+
+    def sigml_url(self, word):
+        return self.sign_urls.get(normalize_gloss(word))
+
+    def is_known(self, word):
+        gloss = normalize_gloss(word)
+        return gloss in self.sign_files or gloss in self.valid_words
+
+    def has_sign(self, word):
+        return normalize_gloss(word) in self.sign_files
+
+    def _normalize(self, word):
+        """The gloss signed for an inflected word ("running" -> "run"); unknown words are unchanged"""
+        gloss = normalize_gloss(word)
+        if gloss in self.sign_files:
+            return gloss
+        return self.inflections.get(gloss, gloss)
+
+    def match_phrase(self, words, start=0):
+        """Longest multi-word gloss starting at words[start] (lowercase words).
+
+        Returns (gloss, number of words matched), or None.
+        """
+        node = self.phrase_trie
+        match = None
+        for i in range(start, len(words)):
+            node = node.get(words[i])
+            if node is None:
+                break
+            gloss = node.get(None)
+            if gloss is not None:
+                match = (gloss, i - start + 1)
+        return match
+
+    def resolve(self, word):
+        """Return the glosses signed for a word: its own sign, or its fingerspelled letters"""
+        gloss = normalize_gloss(word)
+        if gloss in self.sign_files:
+            return [gloss]
+        return [char for char in gloss if char.isalpha() and char in self.sign_files]
+
+    def sign_xml(self, word):
+        """Return the sign elements of a gloss's SiGML file, kept in memory after the first read"""
+        gloss = normalize_gloss(word)
+        xml = self._sign_xml.get(gloss)
+        if xml is None:
+            file_name = self.sign_files.get(gloss)
+            if file_name is None:
+                return None
+            with open(os.path.join(self.sign_dir, file_name), 'r', encoding='utf-8') as f:
+                content = f.read()
+            xml = '\n'.join(match.group(0) for match in SIGN_ELEMENT_PATTERN.finditer(content))
+            self._sign_xml[gloss] = xml
+        return xml
+
+    def sign_seconds(self, gloss):
+        """Estimated signing time of a gloss, computed once per view"""
+        seconds = self._sign_seconds.get(gloss)
+        if seconds is None:
+            seconds = self._sign_seconds[gloss] = estimate_sign_seconds(self.sign_xml(gloss))
+        return seconds
+
+    def preload(self):
+        """Read every sign file now instead of on first use (before forking workers)"""
+        for gloss in self.sign_files:
+            self.sign_seconds(gloss)
+
+    def __len__(self):
+        return len(self.sign_files)
+
+class SignLexicon:
+    """Index of static/SignFiles (plus words.txt and word forms) built once and rebuilt on change.
+
+    Readers get an immutable LexiconView; a rebuild swaps in a new view so a
+    request never sees a half-built index. The directory is checked for
+    changes at most once every refresh_interval seconds.
+    """
+
+    def __init__(self, sign_dir, words_file=None, word_forms_file=None, refresh_interval=LEXICON_REFRESH_SECONDS):
+        self.sign_dir = sign_dir
+        self.words_file = words_file
+        self.word_forms_file = word_forms_file
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._view = None
+        self._checked_at = 0.0
+
+    def current(self):
+        """Return the current view, rebuilding it first if SignFiles changed"""
+        view = self._view
+        if view is None or time.monotonic() - self._checked_at >= self.refresh_interval:
+            view = self.refresh()
+        return view
+
+    def refresh(self, force=False):
+        with self._lock:
+            self._checked_at = time.monotonic()
+            signature = self._signature()
+            view = self._view
+            if force or view is None or view.signature != signature:
+                version = view.version + 1 if view is not None else 1
+                view = self._build(version, signature)
+                self._view = view
+                logging.info(f"Sign lexicon v{version} loaded: {len(view)} signs")
+            return view
+
+    def _signature(self):
+        signature = []
+        for path in (self.sign_dir, self.words_file, self.word_forms_file):
+            try:
+                signature.append(os.stat(path).st_mtime_ns if path else None)
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _build(self, version, signature):
+        sign_files = {}
+        try:
+            entries = list(os.scandir(self.sign_dir))
+        except OSError as e:
+            logging.error(f"Error reading sign files: {e}")
+            entries = []
+
+        for entry in entries:
+            if not entry.name.endswith('.sigml') or not entry.is_file():
+                continue
+            gloss = normalize_gloss(entry.name[:-len('.sigml')])
+            # Prefer an all-lowercase file name if two files fold to the same gloss
+            if gloss in sign_files and sign_files[gloss] == f"{gloss}.sigml":
+                continue
+            sign_files[gloss] = entry.name
+
+        valid_words = set()
+        if self.words_file and os.path.exists(self.words_file):
+            with open(self.words_file, 'r') as f:
+                valid_words = {normalize_gloss(line) for line in f if line.strip()}
+
+        word_forms = {}
+        if self.word_forms_file and os.path.exists(self.word_forms_file):
+            with open(self.word_forms_file, 'r', encoding='utf-8') as f:
+                word_forms = json.load(f)
+
+        return LexiconView(version, signature, self.sign_dir, sign_files, frozenset(valid_words), word_forms)
+
+sign_lexicon = SignLexicon(SIGN_FILES_DIR, WORDS_FILE_PATH, WORD_FORMS_PATH)
+
+@app.before_request
+def track_request_start():
+    g.request_started = time.perf_counter()
+    g.metrics_endpoint = request.endpoint or 'unknown'
+    REQUESTS_IN_FLIGHT.labels(endpoint=g.metrics_endpoint).inc()
+
+@app.teardown_request
+def track_request_end(exc=None):
+    if 'request_started' in g:
+        REQUESTS_IN_FLIGHT.labels(endpoint=g.metrics_endpoint).dec()
+        REQUEST_SECONDS.labels(endpoint=g.metrics_endpoint, method=request.method).observe(
+            time.perf_counter() - g.request_started)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics, over all worker processes when served by serve.py"""
+    registry = REGISTRY
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), headers={'Content-Type': CONTENT_TYPE_LATEST})
 
 @app.route('/')
 def index():
     return render_template('upload.html')
 
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: models are loaded and warmed up"""
+    models.start()
+    body = {'status': models.status, 'timings': {name: round(value, 3) for name, value in models.timings.items()}}
+    if models.error:
+        body['error'] = models.error
+    if models.whisper is not None:
+        body['whisper'] = {'config': WHISPER_CONFIG.identity, 'slots': models.whisper.capacity,
+                           'free_slots': models.whisper.available}
+    return jsonify(body), (200 if models.ready else 503)
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     if 'file' not in request.files:
@@ -83,103 +888,1319 @@ def upload_file():
         return jsonify({'error': 'No selected file'}), 400
 
     if allowed_file(file.filename):
-        # Generate unique filename to avoid conflicts
-        original_filename = file.filename
-        file_extension = original_filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4().hex}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, unique_filename)
-        
-        file.save(file_path)
-        logging.info(f"File uploaded: {original_filename} -> {unique_filename}")
+        if request.form.get('stream'):
+            return upload_file_streaming(file)
+
+        # Short clips are decoded from the request buffer and never touch the disk
+        if is_in_memory_upload(file):
+            original_filename, unique_filename, content, media_hash = hold_upload(file)
+            media, file_path = io.BytesIO(content), None
+        else:
+            original_filename, unique_filename, file_path, media_hash = save_upload(file)
+            media = file_path
 
         try:
-            # Transcribe audio
-            segments, info = model.transcribe(file_path)
-            text = " ".join([seg.text for seg in segments]).strip()
+            # A request cannot wait behind long transcriptions the way a queued job can
+            text, translation, timeline = process_media(media, media_hash=media_hash,
+                                                        slot_timeout=WHISPER_BUSY_WAIT_SECONDS)
 
             if not text:
                 # Clean up file if transcription fails
-                os.remove(file_path)
+                discard_upload(unique_filename, file_path)
                 return jsonify({'error': 'No transcription available.'}), 500
 
-            logging.info(f"Transcription: {text}")
-
-            # Convert text to ISL using enhanced logic
-            isl_text, sigml_files = convert_to_isl(text)
-            flat_sigml_files = [file for sentence_files in sigml_files for file in sentence_files]
-
             # Generate media URL for the uploaded file
-            media_url = url_for('static', filename=f'uploads/{unique_filename}')
+            media_url = url_for('uploaded_media', filename=unique_filename)
 
             # Render the results page with media information
             return render_template('index.html', 
                                  text=text, 
-                                 isl_text=isl_text, 
-                                 flat_sigml_files=flat_sigml_files,
+                                 isl_text=translation.isl_text, 
+                                 flat_sigml_files=translation.flat_sigml_files,
+                                 timeline=timeline,
                                  media_url=media_url,
                                  filename=original_filename,
                                  unique_filename=unique_filename)
                                  
+        except ModelsNotReady:
+            return models_not_ready_response()
+        except WhisperBusy:
+            discard_upload(unique_filename, file_path)
+            return whisper_busy_response()
         except Exception as e:
             logging.error(f"Error processing file: {e}")
             # Clean up file if processing fails
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            discard_upload(unique_filename, file_path)
             return jsonify({'error': 'Error processing file.'}), 500
     else:
         return jsonify({'error': 'Invalid file format. Supported formats: mp4, mov, mp3, wav, avi, mkv, m4a, aac, flac'}), 400
 
+def discard_upload(unique_filename, file_path=None):
+    memory_media.discard(unique_filename)
+    if file_path is not None and os.path.exists(file_path):
+        os.remove(file_path)
+
+def upload_file_streaming(file):
+    """Render the results page at once and stream ISL for each segment as it decodes"""
+    if job_queue.is_full():
+        return queue_full_response()
+
+    job = create_job(file, stream=True)
+    try:
+        job_queue.submit(job)
+    except JobQueueFull:
+        os.remove(job.file_path)
+        return queue_full_response()
+
+    return render_template('index.html',
+                         text='',
+                         isl_text=[],
+                         flat_sigml_files=[],
+                         media_url=job.media_url,
+                         filename=job.original_filename,
+                         unique_filename=job.unique_filename,
+                         events_url=url_for('job_events', job_id=job.id))
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue an upload for background transcription and return its job ID at once"""
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file part'}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No selected file'}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file format. Supported formats: mp4, mov, mp3, wav, avi, mkv, m4a, aac, flac'}), 400
+
+    # Reject before saving the upload if there is no room in the queue
+    if job_queue.is_full():
+        return queue_full_response()
+
+    job = create_job(file, stream=bool(request.form.get('stream')))
+    try:
+        job_queue.submit(job)
+    except JobQueueFull:
+        os.remove(job.file_path)
+        return queue_full_response()
+
+    status_url = url_for('job_status', job_id=job.id)
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': status_url,
+        'result_url': url_for('job_result', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id),
+    }), 202, {'Location': status_url}
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.snapshot())
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    snapshot = job.snapshot(include_result=True)
+    if snapshot['status'] == JOB_FAILED:
+        return jsonify(snapshot), 500
+    if snapshot['status'] != JOB_DONE:
+        return jsonify(snapshot), 202, {'Retry-After': '2'}
+    return jsonify(snapshot)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent events stream of a job until it finishes.
+
+    Streaming jobs send a 'segment' event with the ISL glosses and SiGML URLs
+    of each segment as soon as it is decoded; every change also sends a
+    'status' event.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        version = None
+        sent_segments = 0
+        while True:
+            snapshot, segments, version = job.wait_for_update(version, JOB_EVENT_KEEPALIVE_SECONDS, sent_segments)
+            if snapshot is None:
+                yield ": keep-alive\n\n"
+                continue
+            for segment in segments:
+                yield f"event: segment\ndata: {json.dumps(segment)}\n\n"
+            sent_segments += len(segments)
+            yield f"event: status\ndata: {json.dumps(snapshot)}\n\n"
+            if snapshot['status'] in (JOB_DONE, JOB_FAILED):
+                return
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/translate', methods=['POST'])
+def api_translate():
+    """Translate a batch of texts: {"texts": [...]} (or {"text": "..."}) -> per-text results"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object with a "texts" list'}), 400
+
+    texts = data.get('texts')
+    if texts is None and 'text' in data:
+        texts = [data['text']]
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': '"texts" must be a list of strings'}), 400
+    if len(texts) > MAX_BATCH_TEXTS:
+        return jsonify({'error': f'At most {MAX_BATCH_TEXTS} texts per request'}), 413
+
+    try:
+        results = translate_batch(texts)
+    except ModelsNotReady:
+        return models_not_ready_response()
+
+    return jsonify({'results': [translation.to_dict() for translation in results]})
+
+@app.route('/sigml/bundle', methods=['GET', 'POST'])
+def sigml_bundle():
+    """One <sigml> document holding the signs of many glosses, in order.
+
+    GET takes ?glosses=hello,a,b (sign file names work too); POST takes
+    {"glosses": [...]} for long utterances. Each entry is preceded by a
+    <!-- sign N --> comment so players can split it back into signs.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        glosses = data.get('glosses') if isinstance(data, dict) else None
+    else:
+        glosses = [gloss for gloss in request.args.get('glosses', '').split(',') if gloss]
+
+    if not isinstance(glosses, list) or not all(isinstance(gloss, str) for gloss in glosses):
+        return jsonify({'error': '"glosses" must be a list of strings'}), 400
+    if len(glosses) > SIGML_BUNDLE_MAX_SIGNS:
+        return jsonify({'error': f'At most {SIGML_BUNDLE_MAX_SIGNS} signs per bundle'}), 413
+
+    lexicon_view = sign_lexicon.current()
+    glosses = [normalize_gloss(gloss) for gloss in glosses]
+    use_gzip = request.accept_encodings['gzip'] > 0
+    etag_source = f"{lexicon_view.signature}:{','.join(glosses)}"
+    etag = hashlib.sha1(etag_source.encode('utf-8')).hexdigest() + ('-gz' if use_gzip else '')
+
+    headers = {
+        'Cache-Control': f'public, max-age={SIGML_BUNDLE_MAX_AGE_SECONDS}',
+        'Vary': 'Accept-Encoding',
+    }
+    if request.if_none_match.contains(etag):
+        response = Response(status=304, headers=headers)
+        response.set_etag(etag)
+        return response
+
+    body = build_sigml_bundle(glosses, lexicon_view).encode('utf-8')
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    response = Response(body, mimetype='application/xml', headers=headers)
+    response.set_etag(etag)
+    return response
+
+def build_sigml_bundle(glosses, lexicon_view=None):
+    """Concatenate the sign elements of the glosses into a single SiGML document"""
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+
+    parts = ['<?xml version="1.0" encoding="utf-8"?>', '<sigml>']
+    for i, gloss in enumerate(glosses):
+        parts.append(f'<!-- sign {i} -->')
+        xml = lexicon_view.sign_xml(gloss)
+        if xml:
+            parts.append(xml)
+    parts.append('</sigml>')
+    return '\n'.join(parts) + '\n'
+
+def models_not_ready_response():
+    return (jsonify({'error': 'Models are still loading, try again shortly.'}), 503,
+            {'Retry-After': str(JOB_RETRY_AFTER_SECONDS)})
+
+def whisper_busy_response():
+    return (jsonify({'error': 'Speech recognition is busy, try again later or submit a job.'}), 503,
+            {'Retry-After': str(JOB_RETRY_AFTER_SECONDS)})
+
+def queue_full_response():
+    return (jsonify({'error': 'Too many queued jobs, try again later.'}), 429,
+            {'Retry-After': str(JOB_RETRY_AFTER_SECONDS)})
+
 @app.route('/cleanup/<filename>')
 def cleanup_file(filename):
     """Optional: Endpoint to clean up uploaded files after use"""
     try:
         file_path = os.path.join(UPLOAD_DIR, filename)
+        held = memory_media.discard(filename)
         if os.path.exists(file_path):
             os.remove(file_path)
-            return jsonify({'success': 'File cleaned up'}), 200
-        else:
+        elif not held:
             return jsonify({'error': 'File not found'}), 404
+        return jsonify({'success': 'File cleaned up'}), 200
     except Exception as e:
         logging.error(f"Error cleaning up file: {e}")
         return jsonify({'error': 'Error cleaning up file'}), 500
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify({
+        'transcripts': transcript_cache.stats(),
+        'translations': translation_cache.stats(),
+        'normalizer': sign_lexicon.current().normalize.cache_info()._asdict(),
+    })
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Enhanced word processing functions
-def remove_suffixes(word):
-    """Remove common English suffixes like -ed, -ing, -ly, -er, -est, -s"""
-    word = word.lower().strip()
-    
-    # List of suffixes to remove (ordered by length to avoid issues)
-    suffixes = ['ing', 'ed', 'ly', 'er', 'est', 's']
-    
-    for suffix in suffixes:
-        if word.endswith(suffix) and len(word) > len(suffix) + 2:  # Keep minimum word length
-            # Special handling for some cases
-            if suffix == 'ed':
-                if word.endswith('ied'):
-                    return word[:-3] + 'y'  # tried -> try
-                elif word.endswith('ed'):
-                    return word[:-2]
-            elif suffix == 'ing':
-                if word.endswith('ing'):
-                    base = word[:-3]
-                    # Handle doubling cases (running -> run)
-                    if len(base) >= 2 and base[-1] == base[-2] and base[-1] in 'bcdfghjklmnpqrstvwxyz':
-                        return base[:-1]
-                    return base
-            elif suffix == 's' and not word.endswith('ss'):
-                if word.endswith('ies'):
-                    return word[:-3] + 'y'  # flies -> fly
-                elif word.endswith('es'):
-                    return word[:-2]
-                elif word.endswith('s'):
-                    return word[:-1]
-            else:
-                return word[:-len(suffix)]
-    
-    return word
+class UploadSpool:
+    """Receives an uploaded file's bytes as the form parser streams them in.
+
+    The content is hashed while it is written. Small uploads stay in memory;
+    the rest go straight to a temporary file in UPLOAD_DIR that save_upload
+    renames, so the bytes are written once and never copied.
+    """
+
+    def __init__(self, in_memory):
+        self.digest = hashlib.sha256()
+        self.in_memory = in_memory
+        if in_memory:
+            self.path = None
+            self._file = io.BytesIO()
+        else:
+            os.makedirs(UPLOAD_DIR, exist_ok=True)
+            fd, self.path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix='.part')
+            self._file = os.fdopen(fd, 'w+b')
+
+    def write(self, data):
+        self.digest.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        # read, seek, tell, ... for FileStorage
+        return getattr(self._file, name)
+
+    def getvalue(self):
+        return self._file.getvalue()
+
+    def persist(self, path):
+        """Store the upload at path"""
+        if self.in_memory:
+            with open(path, 'wb') as out:
+                out.write(self._file.getbuffer())
+        else:
+            self._file.close()
+            os.replace(self.path, path)
+            self.path = None
+
+    def close(self):
+        # Called when the request ends; drops uploads nobody stored
+        self._file.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+            self.path = None
+
+class UploadRequest(Request):
+    """Request that streams file uploads into UploadSpools"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        in_memory = total_content_length is not None and total_content_length <= IN_MEMORY_UPLOAD_BYTES
+        return UploadSpool(in_memory)
+
+app.request_class = UploadRequest
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    return jsonify({'error': f'File too large (limit {MAX_UPLOAD_BYTES // (1024 * 1024)} MB).'}), 413
+
+def upload_spool(file):
+    """The UploadSpool holding an uploaded file, filling a new one if it was not parsed into one"""
+    if isinstance(file.stream, UploadSpool):
+        return file.stream
+    spool = UploadSpool(in_memory=False)
+    try:
+        while True:
+            chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+def is_in_memory_upload(file):
+    return isinstance(file.stream, UploadSpool) and file.stream.in_memory
+
+def upload_names(file):
+    """(original name, unique stored name); the content hash only keys the transcript cache"""
+    file_extension = file.filename.rsplit('.', 1)[1].lower()
+    return file.filename, f"{uuid.uuid4().hex}.{file_extension}"
+
+@UPLOAD_SAVE_SECONDS.time()
+def save_upload(file):
+    """Save an uploaded file under a unique name.
+
+    Returns (original, stored name, path, media hash). Each upload gets its
+    own copy, so discarding one never affects another request's media.
+    """
+    spool = upload_spool(file)
+    try:
+        media_hash = spool.digest.hexdigest()
+        original_filename, unique_filename = upload_names(file)
+        file_path = os.path.join(UPLOAD_DIR, unique_filename)
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        spool.persist(file_path)
+    finally:
+        spool.close()
+
+    logging.info(f"File uploaded: {original_filename} -> {unique_filename}")
+    return original_filename, unique_filename, file_path, media_hash
+
+def hold_upload(file):
+    """Keep a small upload in memory for the player instead of saving it.
+
+    Returns (original, stored name, content, media hash).
+    """
+    spool = file.stream
+    media_hash = spool.digest.hexdigest()
+    original_filename, unique_filename = upload_names(file)
+    content = spool.getvalue()
+    memory_media.put(unique_filename, content)
+    logging.info(f"File uploaded: {original_filename} -> {unique_filename} (in memory)")
+    return original_filename, unique_filename, content, media_hash
+
+class MemoryMediaStore:
+    """In-memory uploads, served to the media player by /media.
+
+    Keyed by the unique stored name of each upload, so discarding one
+    request's media never drops another's. Bounded by total size: the oldest
+    entries are written to UPLOAD_DIR when it fills up, so their URLs keep
+    working.
+    """
+
+    def __init__(self, max_bytes=MEMORY_MEDIA_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, filename, content):
+        with self._lock:
+            previous = self._entries.pop(filename, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[filename] = content
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes and self._entries:
+                spilled, spilled_content = self._entries.popitem(last=False)
+                self._bytes -= len(spilled_content)
+                os.makedirs(UPLOAD_DIR, exist_ok=True)
+                with open(os.path.join(UPLOAD_DIR, spilled), 'wb') as out:
+                    out.write(spilled_content)
+
+    def get(self, filename):
+        with self._lock:
+            content = self._entries.get(filename)
+            if content is not None:
+                self._entries.move_to_end(filename)
+            return content
+
+    def discard(self, filename):
+        """Drop an entry; returns whether it was held"""
+        with self._lock:
+            content = self._entries.pop(filename, None)
+            if content is None:
+                return False
+            self._bytes -= len(content)
+            return True
+
+memory_media = MemoryMediaStore()
+
+# words: (start, end, word) tuples, empty when Whisper gave no word timings
+TranscriptSegment = namedtuple('TranscriptSegment', ['start', 'end', 'text', 'words'], defaults=((),))
+TranscriptInfo = namedtuple('TranscriptInfo', ['duration'])
+
+def decode_segment(seg, offset=0.0):
+    """A Whisper segment as a TranscriptSegment, shifted by offset seconds"""
+    words = tuple((word.start + offset, word.end + offset, word.word) for word in (getattr(seg, 'words', None) or ()))
+    return TranscriptSegment(seg.start + offset, seg.end + offset, seg.text, words)
+
+def transcript_segments(entry):
+    """The TranscriptSegments of a transcript cache entry (entries cached without word timings have none)"""
+    return [TranscriptSegment(start, end, text, tuple(tuple(word) for word in (words[0] if words else ())))
+            for start, end, text, *words in entry['segments']]
+
+def transcribe_media(media, on_segment=None, media_hash=None, slot_timeout=None):
+    """Transcribe a media file (path or file object); on_segment(segment, info) is called as each segment decodes.
+
+    Returns (text, cache entry). When media_hash is given the transcript is
+    served from, or stored in, the transcript cache. slot_timeout bounds the
+    wait for a free Whisper slot (WhisperBusy after it); None waits until one frees.
+    """
+    entry = transcript_cache.get(media_hash) if media_hash else None
+    if entry is not None:
+        info = TranscriptInfo(duration=entry['duration'])
+        if on_segment is not None:
+            for seg in transcript_segments(entry):
+                on_segment(seg, info)
+        return entry['text'], entry
+
+    started = time.perf_counter()
+    # In-memory uploads are too short to be worth splitting
+    if isinstance(media, str) and chunked_transcriber.should_split(media):
+        segments, info = chunked_transcriber.transcribe(media)
+    else:
+        segments, info = models.get_whisper().transcribe(media, timeout=slot_timeout)
+    decoded = []
+    callback_seconds = 0.0
+    try:
+        for seg in segments:
+            # Chunked transcription already yields TranscriptSegments
+            if not isinstance(seg, TranscriptSegment):
+                seg = decode_segment(seg)
+            decoded.append(seg)
+            if on_segment is not None:
+                callback_started = time.perf_counter()
+                on_segment(seg, info)
+                callback_seconds += time.perf_counter() - callback_started
+    finally:
+        # Hand the Whisper slot back (or cancel chunks) even if on_segment raised
+        close = getattr(segments, 'close', None)
+        if close is not None:
+            close()
+
+    # Decoding only: on_segment callbacks (ISL conversion when streaming) are not Whisper time
+    elapsed = time.perf_counter() - started - callback_seconds
+    TRANSCRIPTION_SECONDS.observe(elapsed)
+    if info.duration:
+        AUDIO_SECONDS.observe(info.duration)
+        TRANSCRIPTION_RTF.observe(elapsed / info.duration)
+    text = " ".join([seg.text for seg in decoded]).strip()
+
+    entry = {
+        'text': text,
+        'duration': info.duration,
+        'segments': [[seg.start, seg.end, seg.text, [list(word) for word in seg.words]] for seg in decoded],
+    }
+    if media_hash and text:
+        transcript_cache.put(media_hash, entry)
+    return text, entry
+
+def media_duration(file_path):
+    """Container duration in seconds, read without decoding the audio (None if unknown)"""
+    import av
+
+    try:
+        with av.open(file_path) as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception as e:
+        logging.warning(f"Could not read duration of {file_path}: {str(e)}")
+    return None
+
+def plan_chunks(speech, total_samples, target_samples, overlap_samples):
+    """Split audio into chunks of about target_samples, cutting in silences where possible.
+
+    speech is the VAD output ({'start', 'end'} in samples). Returns a list of
+    (audio_start, audio_end, own_start, own_end): the span to transcribe and
+    the span whose segments the chunk keeps. Chunks cut mid-speech overlap
+    their neighbours by overlap_samples.
+    """
+    # Candidate cut points: the middle of every gap between speech regions
+    silences = [(previous['end'] + region['start']) // 2 for previous, region in zip(speech, speech[1:])]
+
+    chunks = []
+    own_start = 0
+    hard_cut = False
+    while total_samples - own_start > target_samples * 1.5:
+        ideal = own_start + target_samples
+        candidates = [point for point in silences
+                      if own_start + target_samples // 2 <= point <= own_start + target_samples * 3 // 2]
+        audio_start = own_start - overlap_samples if hard_cut else own_start
+        if candidates:
+            own_end = min(candidates, key=lambda point: abs(point - ideal))
+            hard_cut = False
+            chunks.append((audio_start, own_end, own_start, own_end))
+        else:
+            # No silence nearby: cut mid-speech and let the neighbours overlap
+            own_end = ideal
+            hard_cut = True
+            chunks.append((audio_start, own_end + overlap_samples, own_start, own_end))
+        own_start = own_end
+
+    audio_start = own_start - overlap_samples if hard_cut else own_start
+    chunks.append((max(0, audio_start), total_samples, own_start, total_samples))
+    return chunks
+
+# Per-process model used by chunk workers
+_chunk_worker_model = None
+
+def _init_chunk_worker(cpu_threads):
+    global _chunk_worker_model
+    _chunk_worker_model = load_whisper_model(replace(WHISPER_CONFIG, cpu_threads=cpu_threads, num_workers=1))
+
+def _transcribe_chunk(audio, offset, own_start, own_end):
+    """Transcribe one chunk in a worker process; returns segments on the media timeline"""
+    segments, _ = _chunk_worker_model.transcribe(audio, **WHISPER_TRANSCRIBE_OPTIONS)
+    kept = []
+    for seg in segments:
+        seg = decode_segment(seg, offset)
+        # Segments in an overlap belong to the chunk holding their midpoint
+        if own_start <= (seg.start + seg.end) / 2 < own_end:
+            kept.append(seg)
+    return kept
+
+class ChunkedTranscriber:
+    """Transcribes long media as parallel chunks in a pool of Whisper processes.
+
+    The pool is started on first use and kept, so each process loads its
+    model once. Segments come back in media order with absolute timestamps.
+    """
+
+    def __init__(self, processes=TRANSCRIBE_PROCESSES, min_seconds=LONG_MEDIA_SECONDS,
+                 chunk_seconds=CHUNK_TARGET_SECONDS, overlap_seconds=CHUNK_OVERLAP_SECONDS):
+        self.processes = processes
+        self.min_seconds = min_seconds
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def should_split(self, file_path):
+        if self.processes < 2:
+            return False
+        duration = media_duration(file_path)
+        return duration is not None and duration >= self.min_seconds
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Split the cores between the processes instead of oversubscribing them
+                cpu_threads = max(1, (os.cpu_count() or 1) // self.processes)
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    # Forking would copy the server's threads and locks
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_chunk_worker,
+                    initargs=(cpu_threads,),
+                )
+                logging.info(f"Started {self.processes} transcription processes ({cpu_threads} threads each)")
+            return self._executor
+
+    def transcribe(self, file_path):
+        """Return (segment iterator, info) like WhisperModel.transcribe"""
+        from faster_whisper.audio import decode_audio
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        audio = decode_audio(file_path, sampling_rate=AUDIO_SAMPLE_RATE)
+        speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+        chunks = plan_chunks(speech, len(audio), int(self.chunk_seconds * AUDIO_SAMPLE_RATE),
+                             int(self.overlap_seconds * AUDIO_SAMPLE_RATE))
+        info = TranscriptInfo(duration=len(audio) / AUDIO_SAMPLE_RATE)
+        logging.info(f"Transcribing {file_path} as {len(chunks)} chunks ({info.duration:.0f}s of audio)")
+
+        executor = self.executor()
+        futures = [
+            executor.submit(_transcribe_chunk, audio[audio_start:audio_end],
+                            audio_start / AUDIO_SAMPLE_RATE, own_start / AUDIO_SAMPLE_RATE,
+                            own_end / AUDIO_SAMPLE_RATE)
+            for audio_start, audio_end, own_start, own_end in chunks
+        ]
+        return self._collect(futures), info
+
+    def _collect(self, futures):
+        # Yield in media order so streaming callers still see segments in sequence
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+chunked_transcriber = ChunkedTranscriber()
+
+def create_job(file, stream=False):
+    original_filename, unique_filename, file_path, media_hash = save_upload(file)
+    return TranscriptionJob(
+        file_path=file_path,
+        media_hash=media_hash,
+        original_filename=original_filename,
+        unique_filename=unique_filename,
+        media_url=url_for('uploaded_media', filename=unique_filename),
+        size_bytes=os.path.getsize(file_path),
+        stream=stream,
+    )
+
+def process_media(media, on_segment=None, media_hash=None, slot_timeout=None):
+    """Transcribe a media file (path or file object) and convert the text to ISL.
+
+    Returns (text, translation, timeline), timeline being the signs scheduled
+    against the media (see build_timeline). slot_timeout is passed to transcribe_media.
+    """
+    text, entry = transcribe_media(media, on_segment, media_hash, slot_timeout)
+    if not text:
+        return text, None, []
+
+    logging.info(f"Transcription: {text}")
+
+    # Reuse the cached ISL result unless the sign lexicon changed since
+    lexicon_view = sign_lexicon.current()
+    translation = transcript_cache.cached_translation(entry, lexicon_view)
+    timeline = entry.get('timeline') if translation is not None else None
+    if timeline is None:
+        # Convert text to ISL segment by segment, so the glosses are the timeline's signs
+        translation, timeline = translate_segments(text, transcript_segments(entry), lexicon_view)
+        if media_hash:
+            transcript_cache.put(media_hash, dict(entry, isl=translation.to_dict(), timeline=timeline,
+                                                  lexicon_signature=list(lexicon_view.signature),
+                                                  pipeline=translation_pipeline_identity()))
+    return text, translation, timeline
+
+class TranscriptCache:
+    """Persistent transcripts keyed by media content hash plus model identity.
+
+    Each entry holds the segments, full text and last ISL result as one JSON
+    file. Entries older than max_age_seconds are dropped and the least
+    recently used ones are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir, model_identity, max_bytes=TRANSCRIPT_CACHE_MAX_BYTES,
+                 max_age_seconds=TRANSCRIPT_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.model_identity = model_identity
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def key(self, media_hash):
+        identity = f"{TRANSCRIPT_CACHE_FORMAT}:{self.model_identity}:{media_hash}"
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def _path(self, media_hash):
+        return os.path.join(self.cache_dir, f"{self.key(media_hash)}.json")
+
+    def get(self, media_hash):
+        path = self._path(media_hash)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if time.time() - entry['created_at'] > self.max_age_seconds:
+                raise KeyError('expired')
+            # Touch the entry so eviction removes the least recently used first
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        logging.info(f"Transcript cache hit for {media_hash[:12]}")
+        return entry
+
+    def put(self, media_hash, entry):
+        entry = dict(entry, created_at=entry.get('created_at', time.time()),
+                     model=self.model_identity)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # dumps() encodes in C; dump() streams through the pure-Python encoder
+                f.write(json.dumps(entry))
+            os.replace(tmp_path, self._path(media_hash))
+        except OSError as e:
+            logging.error(f"Error writing transcript cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def cached_translation(self, entry, lexicon_view):
+        """Rebuild the stored ISL result if it was made with the current lexicon"""
+        isl = entry.get('isl')
+        if not isl or entry.get('lexicon_signature') != list(lexicon_view.signature):
+            return None
+        if entry.get('pipeline') != translation_pipeline_identity():
+            return None
+        return ISLTranslation(
+            text=isl['text'],
+            sentences=tuple(isl['sentences']),
+            isl_text=tuple(tuple(words) for words in isl['isl_text']),
+            sigml_files=tuple(tuple(files) for files in isl['sigml_files']),
+            lexicon_version=lexicon_view.version,
+        )
+
+    def evict(self):
+        with self._lock:
+            try:
+                entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')]
+            except OSError:
+                return
+
+            now = time.time()
+            files = []
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in files)
+            # Oldest (least recently used) first
+            for mtime, size, path in sorted(files):
+                if now - mtime <= self.max_age_seconds and total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+transcript_cache = TranscriptCache(
+    TRANSCRIPT_CACHE_DIR,
+    model_identity=WHISPER_CONFIG.identity,
+)
+
+# Background transcription jobs
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+class JobQueueFull(Exception):
+    """Raised when the job queue already holds JOB_QUEUE_MAX waiting jobs"""
+
+class TranscriptionJob:
+    """An uploaded file waiting for (or going through) transcription and ISL conversion"""
+
+    def __init__(self, file_path, original_filename, unique_filename, media_url, size_bytes,
+                 stream=False, media_hash=None):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.media_hash = media_hash
+        self.original_filename = original_filename
+        self.unique_filename = unique_filename
+        self.media_url = media_url
+        self.size_bytes = size_bytes
+        # Streaming jobs convert each segment to ISL as soon as it is decoded
+        self.stream = stream
+        self.segments = []
+        self.status = JOB_QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Earlier deadline runs first: short clips overtake long ones, but a
+        # long job is never starved because its deadline eventually comes up
+        self.priority = time.monotonic() + size_bytes / JOB_PRIORITY_BYTES_PER_SECOND
+        self._version = 0
+        self._changed = threading.Condition()
+        # Serializes state file writes, which happen outside _changed
+        self._publish_lock = threading.Lock()
+        self._published_version = -1
+
+    def update(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._version += 1
+            state = self._shared_state()
+            self._changed.notify_all()
+        self._publish(state)
+
+    def publish(self):
+        """Make the job visible to the other server processes (when JOB_STATE_DIR is set)"""
+        with self._changed:
+            state = self._shared_state()
+        self._publish(state)
+
+    def snapshot(self, include_result=False):
+        with self._changed:
+            return self._to_dict(include_result)
+
+    def add_segment(self, segment, progress):
+        with self._changed:
+            self.segments.append(segment)
+            self.progress = progress
+            self._version += 1
+            if JOB_STATE_DIR:
+                # Appended, so each segment is written once however long the media
+                try:
+                    with open(job_state_path(self.id, '.segments.jsonl'), 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(segment) + '\n')
+                except OSError as e:
+                    logging.error(f"Error writing job segments: {e}")
+            state = self._shared_state()
+            self._changed.notify_all()
+        self._publish(state)
+
+    def wait_for_update(self, seen_version, timeout, segments_from=0):
+        """Block until the job changes after seen_version.
+
+        Returns (snapshot, new segments since segments_from, version), or
+        (None, [], seen_version) if nothing changed before the timeout.
+        """
+        with self._changed:
+            if self._version == seen_version:
+                self._changed.wait(timeout)
+            if self._version == seen_version:
+                return None, [], seen_version
+            return self._to_dict(include_result=True), self.segments[segments_from:], self._version
+
+    def _to_dict(self, include_result):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': round(self.progress, 3),
+            'filename': self.original_filename,
+            'stream': self.stream,
+            'segments_ready': len(self.segments),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.result is not None:
+            data['result'] = self.result
+        return data
+
+    def _shared_state(self):
+        """What _publish writes; taken under _changed"""
+        if not JOB_STATE_DIR:
+            return None
+        return dict(self._to_dict(include_result=True), version=self._version)
+
+    def _publish(self, state):
+        """Write a state from _shared_state(), outside _changed so readers and the worker are not held up"""
+        if state is None:
+            return
+        with self._publish_lock:
+            # A newer state may have been written while this one waited
+            if state['version'] <= self._published_version:
+                return
+            os.makedirs(JOB_STATE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=JOB_STATE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(state))
+                os.replace(tmp_path, job_state_path(self.id))
+            except OSError as e:
+                logging.error(f"Error writing job state: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            self._published_version = state['version']
+
+def job_state_path(job_id, suffix='.json'):
+    return os.path.join(JOB_STATE_DIR, job_id + suffix)
+
+class SharedJob:
+    """A job accepted by another server process, followed through JOB_STATE_DIR.
+
+    Offers the read side of TranscriptionJob (snapshot, wait_for_update) by
+    polling the state file the owning process rewrites on every change.
+    """
+
+    def __init__(self, job_id, state):
+        self.id = job_id
+        self._state = state
+        # Segments read so far, and where the next one starts in the segments file
+        self._segments_read = []
+        self._segments_offset = 0
+
+    @classmethod
+    def load(cls, job_id):
+        state = cls._read(job_id)
+        return cls(job_id, state) if state is not None else None
+
+    @staticmethod
+    def _read(job_id):
+        try:
+            with open(job_state_path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _refresh(self):
+        # Keep the last state seen if the file has expired since
+        self._state = self._read(self.id) or self._state
+        data = dict(self._state)
+        return data, data.pop('version')
+
+    def snapshot(self, include_result=False):
+        data, _ = self._refresh()
+        if not include_result:
+            data.pop('result', None)
+        return data
+
+    def wait_for_update(self, seen_version, timeout, segments_from=0):
+        """Like TranscriptionJob.wait_for_update, checking every JOB_STATE_POLL_SECONDS"""
+        deadline = time.monotonic() + timeout
+        data, version = self._refresh()
+        while version == seen_version:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, [], seen_version
+            time.sleep(min(JOB_STATE_POLL_SECONDS, remaining))
+            data, version = self._refresh()
+        return data, self._segments(segments_from, data['segments_ready']), version
+
+    def _segments(self, start, end):
+        # Segments are appended before the state that counts them is written,
+        # so only lines added since the last call need reading
+        if start >= end:
+            return []
+        if len(self._segments_read) < end:
+            try:
+                with open(job_state_path(self.id, '.segments.jsonl'), 'rb') as f:
+                    f.seek(self._segments_offset)
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break
+                        self._segments_offset += len(line)
+                        self._segments_read.append(json.loads(line))
+            except OSError:
+                pass
+        return self._segments_read[start:end]
+
+class JobQueue:
+    """Bounded priority queue drained by a fixed pool of worker threads"""
+
+    def __init__(self, workers=JOB_WORKERS, max_depth=JOB_QUEUE_MAX):
+        self.workers = workers
+        self.max_depth = max_depth
+        self._queue = queue.PriorityQueue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._sequence = itertools.count()
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def is_full(self):
+        return self.depth() >= self.max_depth
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and JOB_STATE_DIR and re.fullmatch(r'[0-9a-f]{32}', job_id):
+            job = SharedJob.load(job_id)
+        return job
+
+    def submit(self, job):
+        with self._lock:
+            if self.depth() >= self.max_depth:
+                raise JobQueueFull()
+            self._start_workers()
+            self._expire_jobs()
+            self._jobs[job.id] = job
+            job.publish()
+            self._queue.put((job.priority, next(self._sequence), job))
+            JOB_QUEUE_DEPTH.set(self.depth())
+        logging.info(f"Job {job.id} queued ({job.original_filename}, depth {self.depth()})")
+
+    def _start_workers(self):
+        # Threads are started lazily so importing the app does not spawn them
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _expire_jobs(self):
+        cutoff = time.time() - JOB_TTL_SECONDS
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+            if JOB_STATE_DIR:
+                for suffix in ('.json', '.segments.jsonl'):
+                    try:
+                        os.remove(job_state_path(job_id, suffix))
+                    except OSError:
+                        pass
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            JOB_QUEUE_DEPTH.set(self.depth())
+            try:
+                run_job(job)
+            finally:
+                self._queue.task_done()
+
+def run_job(job):
+    """Transcribe and convert one queued job, recording progress as segments decode"""
+    job.update(status=JOB_RUNNING, started_at=time.time())
+
+    def on_segment(seg, info):
+        progress = min(seg.end / info.duration, 0.99) if info.duration else job.progress
+        if not job.stream:
+            job.update(progress=progress)
+            return
+
+        translation = translate(seg.text)
+        # Keep this segment's signs after the ones already scheduled
+        after = next((segment['timeline'][-1]['end'] for segment in reversed(job.segments) if segment['timeline']), 0.0)
+        timeline = build_timeline([seg], [translation], after=after)
+        if not job.segments:
+            logging.info(f"Job {job.id}: first segment ready after {time.time() - job.started_at:.2f}s")
+        job.add_segment({
+            'index': len(job.segments),
+            'start': seg.start,
+            'end': seg.end,
+            'text': seg.text.strip(),
+            'isl_text': [list(words) for words in translation.isl_text],
+            'sigml_files': translation.flat_sigml_files,
+            'timeline': timeline,
+        }, progress)
+
+    try:
+        if job.stream:
+            text, _ = transcribe_media(job.file_path, on_segment, job.media_hash)
+            result = {
+                'text': text,
+                'isl_text': [words for segment in job.segments for words in segment['isl_text']],
+                'sigml_files': [segment['sigml_files'] for segment in job.segments],
+                'flat_sigml_files': [file for segment in job.segments for file in segment['sigml_files']],
+                'timeline': [entry for segment in job.segments for entry in segment['timeline']],
+            }
+        else:
+            text, translation, timeline = process_media(job.file_path, on_segment, job.media_hash)
+            if text:
+                result = dict(translation.to_dict(), timeline=timeline)
+
+        if not text:
+            job.update(status=JOB_FAILED, error='No transcription available.', finished_at=time.time())
+            os.remove(job.file_path)
+            return
+
+        result.update({
+            'media_url': job.media_url,
+            'filename': job.original_filename,
+            'unique_filename': job.unique_filename,
+        })
+        job.update(status=JOB_DONE, progress=1.0, result=result, finished_at=time.time())
+    except Exception as e:
+        logging.error(f"Error processing job {job.id}: {e}")
+        job.update(status=JOB_FAILED, error='Error processing file.', finished_at=time.time())
+        # Clean up file if processing fails
+        if os.path.exists(job.file_path):
+            os.remove(job.file_path)
+
+job_queue = JobQueue()
+
+# Live microphone translation
+LiveWord = namedtuple('LiveWord', ['start', 'end', 'text'])
+
+def live_word_key(text):
+    """Word compared between decodes, ignoring case and punctuation"""
+    return re.sub(r"[^\w']", '', text.lower())
+
+class LiveTranscriber:
+    """Incremental transcription of one live audio stream.
+
+    Each update decodes the audio since the last committed word. Words that
+    two consecutive decodes agree on are committed and the audio before them
+    is dropped; the rest stays tentative. Trailing silence (per VAD) commits
+    the whole utterance, and a window that reaches LIVE_MAX_WINDOW_SECONDS
+    commits all but its last word so continuous speech still comes through.
+    """
+
+    def __init__(self, whisper):
+        import numpy as np
+
+        self.whisper = whisper
+        self.audio = np.zeros(0, dtype=np.float32)
+        # Stream time (seconds) of audio[0]
+        self.offset = 0.0
+        self.received = 0
+        self.pending = 0
+        # (samples received so far, monotonic time) per message, for latency
+        self.arrivals = []
+        self.tentative = []
+        self.committed_text = ''
+
+    def add_audio(self, pcm):
+        """Append 16-bit little-endian mono PCM at AUDIO_SAMPLE_RATE"""
+        import numpy as np
+
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype='<i2').astype(np.float32) / 32768.0
+        self.audio = np.concatenate([self.audio, samples])
+        self.received += len(samples)
+        self.pending += len(samples)
+        self.arrivals.append((self.received, time.monotonic()))
+
+    def due(self):
+        return self.pending >= LIVE_STEP_SECONDS * AUDIO_SAMPLE_RATE
+
+    def heard_at(self, stream_time):
+        """When the audio at stream_time arrived"""
+        sample = int(stream_time * AUDIO_SAMPLE_RATE)
+        index = bisect.bisect_left(self.arrivals, (sample,))
+        return self.arrivals[min(index, len(self.arrivals) - 1)][1]
+
+    def update(self, final=False):
+        """Decode the window; returns (newly committed words, tentative words)"""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        self.pending = 0
+        speech = get_speech_timestamps(
+            self.audio, VadOptions(min_silence_duration_ms=int(LIVE_END_SILENCE_SECONDS * 1000)))
+        if not speech:
+            # Keep a little audio in case speech is just starting
+            self.tentative = []
+            self._drop_until(self.offset + max(0.0, len(self.audio) / AUDIO_SAMPLE_RATE - LIVE_END_SILENCE_SECONDS))
+            return [], []
+
+        words = self._decode()
+        speech_end = self.offset + speech[-1]['end'] / AUDIO_SAMPLE_RATE
+        window_end = self.offset + len(self.audio) / AUDIO_SAMPLE_RATE
+        utterance_ended = final or window_end - speech_end >= LIVE_END_SILENCE_SECONDS
+        if utterance_ended:
+            committed, tentative = words, []
+        else:
+            agreed = 0
+            for previous, word in zip(self.tentative, words):
+                if live_word_key(previous.text) != live_word_key(word.text):
+                    break
+                agreed += 1
+            committed, tentative = words[:agreed], words[agreed:]
+            if not committed and window_end - self.offset >= LIVE_MAX_WINDOW_SECONDS:
+                committed, tentative = words[:-1], words[-1:]
+                if not committed:
+                    # Nothing recognizable; keep only the audio of the last word, if any
+                    self._drop_until(tentative[0].start if tentative else speech_end)
+
+        self.tentative = tentative
+        if committed:
+            self.committed_text = (self.committed_text + ''.join(word.text for word in committed))[-200:]
+        if utterance_ended:
+            self._drop_until(speech_end)
+        elif committed:
+            self._drop_until(committed[-1].end)
+        return committed, tentative
+
+    def _decode(self):
+        segments, _ = self.whisper.transcribe(
+            self.audio, timeout=LIVE_MAX_WINDOW_SECONDS, live=True, beam_size=LIVE_BEAM_SIZE, vad_filter=False,
+            word_timestamps=True, condition_on_previous_text=False,
+            initial_prompt=self.committed_text or None)
+        return [LiveWord(self.offset + word.start, self.offset + word.end, word.word)
+                for segment in segments for word in (segment.words or [])]
+
+    def _drop_until(self, stream_time):
+        drop = int((stream_time - self.offset) * AUDIO_SAMPLE_RATE)
+        if drop > 0:
+            self.audio = self.audio[drop:]
+            self.offset += drop / AUDIO_SAMPLE_RATE
+            first_kept = int(self.offset * AUDIO_SAMPLE_RATE)
+            self.arrivals = self.arrivals[bisect.bisect_left(self.arrivals, (first_kept,)):]
+
+live_sessions = threading.BoundedSemaphore(LIVE_MAX_SESSIONS)
+_live_whisper = None
+_live_whisper_lock = threading.Lock()
+
+def live_whisper():
+    """The Whisper pool for live sessions, loading ISL_LIVE_WHISPER_MODEL on first use"""
+    global _live_whisper
+    if not LIVE_WHISPER_MODEL:
+        return models.get_whisper(timeout=0)
+    with _live_whisper_lock:
+        if _live_whisper is None:
+            config = replace(WHISPER_CONFIG, model=LIVE_WHISPER_MODEL, pool_size=1, num_workers=LIVE_MAX_SESSIONS)
+            _live_whisper = WhisperPool(config)
+            logging.info(f"Loaded live Whisper model '{LIVE_WHISPER_MODEL}'")
+        return _live_whisper
+
+def push_live_update(ws, transcriber, final=False):
+    committed, tentative = transcriber.update(final)
+    if committed:
+        text = ''.join(word.text for word in committed).strip()
+        lexicon_view = sign_lexicon.current()
+        translation = translate(text, lexicon_view)
+        glosses = translation_glosses(translation, lexicon_view)
+        latency = time.monotonic() - transcriber.heard_at(committed[-1].end)
+        LIVE_COMMIT_LATENCY.observe(latency)
+        ws.send(json.dumps({
+            'type': 'commit',
+            'text': text,
+            'start': committed[0].start,
+            'end': committed[-1].end,
+            'isl_text': [list(words) for words in translation.isl_text],
+            'sigml_files': translation.flat_sigml_files,
+            # The signs inline, so the player needs no further request
+            'sigml': build_sigml_bundle(glosses, lexicon_view),
+            'latency': round(latency, 3),
+        }))
+    ws.send(json.dumps({'type': 'partial', 'text': ''.join(word.text for word in tentative).strip()}))
+
+@sock.route('/live/ws')
+def live_socket(ws):
+    """Live translation: binary messages carry 16 kHz mono 16-bit PCM, a "stop" text message ends the stream"""
+    if not live_sessions.acquire(blocking=False):
+        ws.send(json.dumps({'type': 'error', 'error': 'Too many live sessions, try again later.'}))
+        return
+    LIVE_SESSIONS.inc()
+    try:
+        transcriber = LiveTranscriber(live_whisper())
+        ws.send(json.dumps({'type': 'ready', 'sample_rate': AUDIO_SAMPLE_RATE}))
+        stopped = False
+        while not stopped:
+            message = ws.receive()
+            # Take everything that queued up while the last decode ran
+            while message is not None:
+                if isinstance(message, str):
+                    stopped = message == 'stop'
+                    if stopped:
+                        break
+                else:
+                    transcriber.add_audio(message)
+                message = ws.receive(timeout=0)
+            if stopped or transcriber.due():
+                push_live_update(ws, transcriber, final=stopped)
+        ws.send(json.dumps({'type': 'done'}))
+    except (ModelsNotReady, WhisperBusy) as e:
+        ws.send(json.dumps({'type': 'error', 'error': f'Speech recognition is not available: {e}'}))
+    finally:
+        LIVE_SESSIONS.dec()
+        live_sessions.release()
+
+@app.route('/live')
+def live():
+    return render_template('live.html', socket_path='/live/ws', sample_rate=AUDIO_SAMPLE_RATE)
 
 def remove_punctuation(text):
     """Remove punctuation from text while preserving word structure"""
@@ -189,166 +2210,155 @@ def remove_punctuation(text):
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
-def filter_and_process_words(word_list_input):
-    """Enhanced word filtering with stop word removal and suffix handling"""
+def filter_and_process_words(word_list_input, lexicon_view=None):
+    """Enhanced word filtering with multi-word signs, stop word removal and suffix handling"""
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+
     processed_sentences = []
     
     for sentence_words in word_list_input:
+        # Convert to lowercase and remove punctuation, skipping empty words
+        cleaned_words = [cleaned for cleaned in (remove_punctuation(word.lower()) for word in sentence_words)
+                         if cleaned]
         processed_words = []
-        
-        for word in sentence_words:
-            # Convert to lowercase and remove punctuation
-            cleaned_word = remove_punctuation(word.lower())
-            
-            # Skip empty words
-            if not cleaned_word:
+
+        i = 0
+        while i < len(cleaned_words):
+            # Multi-word signs ("zebra crossing") win before any word is stripped or dropped
+            phrase = lexicon_view.match_phrase(cleaned_words, i)
+            if phrase is not None:
+                processed_words.append(phrase[0])
+                i += phrase[1]
                 continue
-                
-            # Remove suffixes
-            processed_word = remove_suffixes(cleaned_word)
+
+            cleaned_word = cleaned_words[i]
+            i += 1
+
+            # Map inflections to the sign that exists ("running" -> "run"); other words stay as they are
+            processed_word = lexicon_view.normalize(cleaned_word)
             
-            # Skip stop words
-            if processed_word not in all_stop_words and len(processed_word) > 1:
+            # Skip stop words, in either form ("does" -> "do")
+            if (cleaned_word not in all_stop_words and processed_word not in all_stop_words
+                    and len(processed_word) > 1):
                 processed_words.append(processed_word)
         
         processed_sentences.append(processed_words)
     
     return processed_sentences
 
-# NEW IMPROVED ISL REORDERING FUNCTIONS
-def simple_isl_reorder(words):
-    """
-    Reorders English words to follow ISL (Indian Sign Language) grammar structure.
-    ISL follows: TIME + TOPIC + SUBJECT + OBJECT + VERB + QUESTION/EMOTION
+# ISL REORDERING: rules compiled from data/isl_reorder_rules.json
+class ReorderEngine:
+    """Reorders English words into ISL order using a compiled word -> category table.
+
+    ISL follows: GREETING + TIME + TOPIC + SUBJECT + OBJECT + LOCATION + VERB + QUESTION.
+    Each word is looked up once; words are matched whole, never as substrings.
     """
-    if not words or len(words) <= 2:
-        return words
-    
-    # Initialize categories
-    time_words = []
-    topic_words = []
-    subject_words = []
-    object_words = []
-    verb_words = []
-    question_words = []
-    greeting_words = []
-    location_words = []
-    remaining_words = []
-    
-    # Define word categories for ISL
-    time_indicators = {'today', 'tomorrow', 'yesterday', 'now', 'then', 'when', 'time', 
-                      'morning', 'evening', 'night', 'day', 'week', 'month', 'year'}
-    
-    greetings = {'hello', 'hi', 'welcome', 'good', 'bye', 'thanks', 'thank'}
-    
-    question_indicators = {'what', 'where', 'when', 'why', 'how', 'who', 'which', 'can', 'do'}
-    
-    location_indicators = {'here', 'there', 'where', 'place', 'home', 'school', 'office'}
-    
-    # Common verbs - action words typically come at the end in ISL
-    common_verbs = {'help', 'go', 'come', 'eat', 'drink', 'work', 'play', 'learn', 
-                   'teach', 'read', 'write', 'see', 'hear', 'speak', 'sign'}
-    
-    # Topic/subject indicators
-    topic_indicators = {'we', 'our', 'sign', 'engine', 'system', 'app'}
-    
-    # Process each word
-    for i, word in enumerate(words):
-        word_lower = word.lower()
-        
-        # Categorize words based on ISL grammar
-        if word_lower in greetings:
-            greeting_words.append(word)
-        elif word_lower in time_indicators:
-            time_words.append(word)
-        elif word_lower in question_indicators:
-            question_words.append(word)
-        elif word_lower in location_indicators:
-            location_words.append(word)
-        elif word_lower in common_verbs:
-            verb_words.append(word)
-        elif word_lower in topic_indicators or word_lower in {'deaf', 'people', 'person'}:
-            if word_lower in {'we', 'our', 'i', 'you'}:
-                subject_words.append(word)
-            else:
-                topic_words.append(word)
-        else:
-            # Determine context-based placement
-            if i < len(words) // 2:  # First half - likely topic/subject
-                if word_lower in {'deaf', 'people', 'person', 'student', 'teacher'}:
-                    object_words.append(word)
+
+    def __init__(self, rules):
+        # Stored ISL results are rebuilt when the rules change (see translation_pipeline_identity)
+        self.fingerprint = hashlib.sha1(json.dumps(rules, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        self.order = list(rules['order'])
+        rank = {name: i for i, name in enumerate(self.order)}
+
+        def category(name):
+            if name not in rank:
+                raise ValueError(f"Unknown reorder category '{name}' (not in 'order')")
+            return rank[name]
+
+        # Earlier categories win for words listed more than once
+        self.categories = {}
+        for name, words in rules['categories'].items():
+            for word in words:
+                self.categories.setdefault(word.lower(), category(name))
+        self.early_categories = {word.lower(): category(name)
+                                 for name, words in rules.get('early_categories', {}).items()
+                                 for word in words}
+        self.default_early = category(rules['default_early'])
+        self.default_late = category(rules['default_late'])
+
+        greeting = rules['greeting_pattern']
+        self.greeting_requires = frozenset(word.lower() for word in greeting['requires'])
+        self.greeting_first = frozenset(word.lower() for word in greeting['first'])
+        self.greeting_last = frozenset(word.lower() for word in greeting['last'])
+        self.fronted_words = frozenset(word.lower() for word in rules['fronted_words'])
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def reorder(self, words):
+        """Reorder one sentence, applying the greeting and question patterns first"""
+        if not words or len(words) <= 1:
+            return words
+
+        lowered = [word.lower() for word in words]
+        present = set(lowered)
+
+        # Greeting pattern: greetings first, actions last, everything else in between
+        if self.greeting_requires <= present:
+            first, middle, last = [], [], []
+            for word, lower in zip(words, lowered):
+                if lower in self.greeting_first:
+                    first.append(word)
+                elif lower in self.greeting_last:
+                    last.append(word)
                 else:
-                    topic_words.append(word)
-            else:  # Second half - likely object/remaining
-                remaining_words.append(word)
-    
-    # ISL sentence structure: GREETING + TIME + TOPIC + SUBJECT + OBJECT + LOCATION + VERB + QUESTION
-    reordered = []
-    
-    # Add greetings first (very important in ISL)
-    reordered.extend(greeting_words)
-    
-    # Add time references
-    reordered.extend(time_words)
-    
-    # Add topic/theme of conversation
-    reordered.extend(topic_words)
-    
-    # Add subject (who is doing)
-    reordered.extend(subject_words)
-    
-    # Add object (who/what is being acted upon)
-    reordered.extend(object_words)
-    
-    # Add location
-    reordered.extend(location_words)
-    
-    # Add remaining words
-    reordered.extend(remaining_words)
-    
-    # Add verbs at the end (ISL is typically verb-final)
-    reordered.extend(verb_words)
-    
-    # Add questions/emotions at the very end
-    reordered.extend(question_words)
-    
-    return reordered if reordered else words
+                    middle.append(word)
+            return first + middle + last
+
+        # Questions: question word + the rest in category order
+        if not self.fronted_words.isdisjoint(present):
+            fronted, others, others_lowered = [], [], []
+            for word, lower in zip(words, lowered):
+                if lower in self.fronted_words:
+                    fronted.append(word)
+                else:
+                    others.append(word)
+                    others_lowered.append(lower)
+            return fronted + self._reorder_by_category(others, others_lowered)
+
+        return self._reorder_by_category(words, lowered)
+
+    def reorder_by_category(self, words):
+        """Reorder one sentence by word category only"""
+        return self._reorder_by_category(words, [word.lower() for word in words])
+
+    def reorder_batch(self, sentences):
+        """Reorder many sentences; returns one word list per sentence, in order"""
+        reorder = self.reorder
+        return [reorder(words) for words in sentences]
+
+    def _reorder_by_category(self, words, lowered):
+        if not words or len(words) <= 2:
+            return words
+
+        categories = self.categories
+        early_categories = self.early_categories
+        half = len(words) // 2
+        buckets = [[] for _ in self.order]
+        for i, lower in enumerate(lowered):
+            rank = categories.get(lower)
+            if rank is None:
+                # Unknown words: first half is likely the topic, second half the rest
+                rank = early_categories.get(lower, self.default_early) if i < half else self.default_late
+            buckets[rank].append(words[i])
+        return [word for bucket in buckets for word in bucket]
+
+reorder_engine = ReorderEngine.from_file(REORDER_RULES_PATH)
+
+def translation_pipeline_identity():
+    """Identifies the conversion rules an ISL result was built with"""
+    return f"{TRANSLATION_PIPELINE_VERSION}:{reorder_engine.fingerprint}"
+
+def simple_isl_reorder(words):
+    """Reorder words by ISL category (greeting, time, topic, ..., verb, question)"""
+    return reorder_engine.reorder_by_category(words)
 
 def advanced_isl_reorder(words):
-    """
-    Advanced ISL reordering with better context understanding
-    """
-    if not words or len(words) <= 1:
-        return words
-    
-    # Join words to analyze as a sentence for better context
-    sentence = ' '.join(words).lower()
-    
-    # Special patterns for common ISL structures
-    if 'hello' in sentence and 'welcome' in sentence:
-        # Greeting pattern: Put greetings first
-        greeting_first = []
-        topic_middle = []
-        action_end = []
-        
-        for word in words:
-            if word.lower() in ['hello', 'hi', 'welcome']:
-                greeting_first.append(word)
-            elif word.lower() in ['help', 'go', 'come', 'work']:
-                action_end.append(word)
-            else:
-                topic_middle.append(word)
-        
-        return greeting_first + topic_middle + action_end
-    
-    # For questions: Question word + Topic + Subject + Object + Verb
-    elif any(q in sentence for q in ['what', 'where', 'who', 'how', 'why']):
-        question_words = [w for w in words if w.lower() in ['what', 'where', 'who', 'how', 'why']]
-        other_words = [w for w in words if w.lower() not in ['what', 'where', 'who', 'how', 'why']]
-        return question_words + simple_isl_reorder(other_words)
-    
-    # Default to simple reordering
-    return simple_isl_reorder(words)
+    """ISL reordering with the greeting and question patterns"""
+    return reorder_engine.reorder(words)
 
 # UPDATED: Replaced Stanford Parser with ISL-specific reordering
 def reorder_eng_to_isl(input_string):
@@ -371,8 +2381,9 @@ def reorder_eng_to_isl(input_string):
     try:
         # First try advanced reordering
         reordered = advanced_isl_reorder(input_string)
-        logging.info(f"Original: {input_string}")
-        logging.info(f"ISL Reordered: {reordered}")
+        if DEBUG_DUMPS:
+            logging.info(f"Original: {input_string}")
+            logging.info(f"ISL Reordered: {reordered}")
         return reordered
     except Exception as e:
         logging.error(f"Reordering error: {e}")
@@ -387,17 +2398,112 @@ def reorder_eng_to_isl(input_string):
 # - apply_basic_isl_rules (replaced with better functions above)
 
 # Enhanced ISL conversion functions
-def convert_to_isl(text):
-    clear_all()
-    take_input(text)
-    sigml_files = map_to_sigml_files(final_output_in_sent)
-    return final_output_in_sent, sigml_files
+@dataclass(frozen=True)
+class ISLTranslation:
+    """Immutable result of one text-to-ISL conversion"""
+    text: str
+    sentences: tuple
+    isl_text: tuple  # one tuple of glosses (or fingerspelled letters) per sentence
+    sigml_files: tuple  # one tuple of SiGML URLs per sentence
+    lexicon_version: int
+
+    @property
+    def flat_sigml_files(self):
+        return [file for sentence_files in self.sigml_files for file in sentence_files]
+
+    def to_dict(self):
+        return {
+            'text': self.text,
+            'sentences': list(self.sentences),
+            'isl_text': [list(words) for words in self.isl_text],
+            'sigml_files': [list(files) for files in self.sigml_files],
+            'flat_sigml_files': self.flat_sigml_files,
+        }
+
+class ISLPipeline:
+    """Text-to-ISL conversion whose intermediate state belongs to a single call.
+
+    Create one pipeline per request (or call translate()); nothing is shared
+    between calls except the read-only NLP model and lexicon view.
+    """
+
+    def __init__(self, nlp=None, lexicon_view=None):
+        self.nlp = nlp if nlp is not None else models.get_nlp()
+        self.lexicon_view = lexicon_view if lexicon_view is not None else sign_lexicon.current()
+        self.sent_list = []
+        self.word_list = []
+        self.final_words = []
+        self.final_output_in_sent = []
+
+    def run(self, text):
+        self.take_input(text)
+        return self.result(text)
+
+    def take_input(self, text):
+        # Pass the text through stanza
+        with NLP_SECONDS.time():
+            some_text = self.nlp(prepare_input(text))
+        self.convert(some_text)
 
-def take_input(text):
-    # Clean and preprocess text
+    def result(self, text):
+        with SIGML_MAPPING_SECONDS.time():
+            sigml_files = map_to_sigml_files(self.final_output_in_sent, self.lexicon_view)
+        return ISLTranslation(
+            text=text,
+            sentences=tuple(self.sent_list),
+            isl_text=tuple(tuple(words) for words in self.final_output_in_sent),
+            sigml_files=tuple(tuple(files) for files in sigml_files),
+            lexicon_version=self.lexicon_view.version,
+        )
+
+    def convert(self, some_text):
+        self.convert_to_sentence_list(some_text)
+
+        with REORDER_SECONDS.time():
+            # Apply enhanced word filtering and processing
+            processed_word_list = filter_and_process_words(self.word_list, self.lexicon_view)
+
+            # Reorders the words in input using improved ISL logic
+            for i, words in enumerate(processed_word_list):
+                if words:  # Only process non-empty word lists
+                    processed_word_list[i] = reorder_eng_to_isl(words)
+
+        # Update the final processing
+        self.final_words.extend(processed_word_list)
+        self.convert_to_final()
+        if DEBUG_DUMPS:
+            self.print_lists()
+
+    def convert_to_sentence_list(self, text):
+        # Only the sentence and word texts are kept, not the Stanza objects
+        for sentence in text.sentences:
+            self.sent_list.append(sentence.text)
+            self.word_list.append([word.text for word in sentence.words])
+
+    def convert_to_final(self):
+        word_counts = {'lexicon': 0, 'fingerspelled': 0}
+        for words in self.final_words:
+            if words:  # Only process non-empty word lists
+                self.final_output_in_sent.append(final_output(words, self.lexicon_view, word_counts))
+        # One metric update per text rather than per sentence
+        if word_counts['lexicon']:
+            LEXICON_WORDS.inc(word_counts['lexicon'])
+        if word_counts['fingerspelled']:
+            FINGERSPELLED_WORDS.inc(word_counts['fingerspelled'])
+
+    def print_lists(self):
+        print("--------------------Word List------------------------")
+        pprint.pprint(self.word_list)
+        print("--------------------Final Words------------------------")
+        pprint.pprint(self.final_words)
+        print("---------------Final sentence with letters--------------")
+        pprint.pprint(self.final_output_in_sent)
+
+def prepare_input(text):
+    """Clean text into the form passed to the NLP backend"""
     test_input = remove_punctuation(text.strip()).replace("\n", "").replace("\t", "")
     test_input2 = ""
-    
+
     if len(test_input) == 1:
         test_input2 = test_input
     else:
@@ -405,131 +2511,354 @@ def take_input(text):
         for word in test_input.split("."):
             if word.strip():
                 test_input2 += word.capitalize() + " ."
-    
-    # Pass the text through stanza
-    some_text = en_nlp(test_input2)
-    convert(some_text)
+    return test_input2
+
+def tokenize_batch(nlp, inputs):
+    """Run several prepared inputs through the NLP backend as one batch"""
+    if isinstance(nlp, RuleBasedTokenizer):
+        return [nlp(text) for text in inputs]
+
+    import stanza
+    return nlp.bulk_process([stanza.Document([], text=text) for text in inputs])
+
+def translate(text, lexicon_view=None):
+    """Convert English text to ISL glosses and SiGML URLs; safe to call concurrently.
+
+    Repeated sentences are answered from the translation cache without
+    running the NLP stack.
+    """
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+
+    key = normalize_sentence(text)
+    translation = translation_cache.get(key, lexicon_view.version)
+    if translation is not None:
+        return replace(translation, text=text)
+
+    translation = ISLPipeline(lexicon_view=lexicon_view).run(text)
+    translation_cache.put(key, lexicon_view.version, translation)
+    return translation
+
+def normalize_sentence(text):
+    """Cache key for a sentence: the pipeline ignores case, punctuation and spacing"""
+    return remove_punctuation(text.strip()).lower()
+
+class TranslationCache:
+    """Bounded LRU of ISL translations keyed by normalized sentence text.
+
+    Entries are only valid for the lexicon version they were built with; the
+    whole cache is dropped when the sign lexicon changes.
+    """
+
+    def __init__(self, max_entries=TRANSLATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.lexicon_version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, lexicon_version):
+        with self._lock:
+            if lexicon_version != self.lexicon_version:
+                self._entries.clear()
+                self.lexicon_version = lexicon_version
+            translation = self._entries.get(key)
+            if translation is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return translation
+
+    def put(self, key, lexicon_version, translation):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if lexicon_version != self.lexicon_version:
+                return
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'lexicon_version': self.lexicon_version,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+translation_cache = TranslationCache()
+
+def translate_batch(texts, lexicon_view=None):
+    """Translate many texts at once; returns one ISLTranslation per text, in order.
+
+    Cached and duplicate texts are resolved without NLP; the remaining ones
+    go through the NLP backend in a single batched call.
+    """
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+
+    results = [None] * len(texts)
+    pending = OrderedDict()  # cache key -> indexes of texts with that key
+    for i, text in enumerate(texts):
+        key = normalize_sentence(text)
+        if key in pending:
+            pending[key].append(i)
+            continue
+        translation = translation_cache.get(key, lexicon_view.version)
+        if translation is not None:
+            results[i] = replace(translation, text=text)
+        else:
+            pending[key] = [i]
+
+    if pending:
+        nlp = models.get_nlp()
+        indexes = list(pending.values())
+        started = time.perf_counter()
+        docs = tokenize_batch(nlp, [prepare_input(texts[same[0]]) for same in indexes])
+        # Spread the batch over its texts so the histogram stays per text
+        per_text = (time.perf_counter() - started) / len(indexes)
+        for _ in indexes:
+            NLP_SECONDS.observe(per_text)
+        for key, same, doc in zip(pending, indexes, docs):
+            pipeline = ISLPipeline(nlp=nlp, lexicon_view=lexicon_view)
+            pipeline.convert(doc)
+            translation = pipeline.result(texts[same[0]])
+            translation_cache.put(key, lexicon_view.version, translation)
+            for i in same:
+                results[i] = replace(translation, text=texts[i])
+
+    return results
+
+def convert_to_isl(text):
+    translation = translate(text)
+    return translation.isl_text, translation.sigml_files
+
+def final_output(input_words, lexicon_view=None, word_counts=None):
+    """Process final words and handle missing sigml files.
+
+    Signed and fingerspelled words are added to word_counts (source -> count) when
+    given; the caller records them in isl_words_total once per text.
+    """
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
 
-def convert(some_text):
-    convert_to_sentence_list(some_text)
-    convert_to_word_list(sent_list_detailed)
-    
-    # Apply enhanced word filtering and processing
-    processed_word_list = filter_and_process_words(word_list)
-    
-    # Reorders the words in input using improved ISL logic
-    for i, words in enumerate(processed_word_list):
-        if words:  # Only process non-empty word lists
-            processed_word_list[i] = reorder_eng_to_isl(words)
-    
-    # Update the final processing
-    final_words.extend(processed_word_list)
-    convert_to_final()
-    print_lists()
-
-def convert_to_sentence_list(text):
-    for sentence in text.sentences:
-        sent_list.append(sentence.text)
-        sent_list_detailed.append(sentence)
-
-def convert_to_word_list(sentences):
-    temp_list = []
-    temp_list_detailed = []
-    for sentence in sentences:
-        for word in sentence.words:
-            temp_list.append(word.text)
-            temp_list_detailed.append(word)
-        word_list.append(temp_list.copy())
-        word_list_detailed.append(temp_list_detailed.copy())
-        temp_list.clear()
-        temp_list_detailed.clear()
-
-def final_output(input_words):
-    """Process final words and handle missing sigml files"""
-    words_file_path = os.path.join(BASE_PATH, "words.txt")
-    if os.path.exists(words_file_path):
-        valid_words = open(words_file_path, 'r').read().split('\n')
-    else:
-        valid_words = []
-    
     fin_words = []
+    known = spelled = 0
     for word in input_words:
         word = word.lower().strip()
         if not word:
             continue
-            
-        # Check if sigml file exists for the word
-        sigml_path = os.path.join(SIGN_FILES_DIR, f"{word}.sigml")
-        if not os.path.exists(sigml_path) and word not in valid_words:
+
+        # Check if a sign exists for the word
+        if not lexicon_view.is_known(word):
             # If no sigml file exists, use letters
+            spelled += 1
             for letter in word:
                 if letter.isalpha():
-                    fin_words.append(letter.lower())
+                    fin_words.append(letter)
         else:
+            known += 1
             fin_words.append(word)
 
+    if word_counts is not None:
+        word_counts['lexicon'] += known
+        word_counts['fingerspelled'] += spelled
     return fin_words
 
-def convert_to_final():
-    for words in final_words:
-        if words:  # Only process non-empty word lists
-            final_output_in_sent.append(final_output(words))
+def map_to_sigml_files(isl_text_list, lexicon_view=None):
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
 
-def print_lists():
-    print("--------------------Word List------------------------")
-    pprint.pprint(word_list)
-    print("--------------------Final Words------------------------")
-    pprint.pprint(final_words)
-    print("---------------Final sentence with letters--------------")
-    pprint.pprint(final_output_in_sent)
-
-def map_to_sigml_files(isl_text_list):
     sigml_file_urls = []
     for sentence in isl_text_list:
         sentence_files = []
         for word in sentence:
             if not word:
                 continue
-                
-            sigml_file = f"{word.lower()}.sigml"
-            sigml_path = os.path.join(SIGN_FILES_DIR, sigml_file)
-            
-            if os.path.exists(sigml_path):
-                sigml_url = url_for('static', filename=f'SignFiles/{sigml_file}')
-                sentence_files.append(sigml_url)
-            else:
-                # Use character-by-character spelling
-                spelling_files = []
-                for char in word.lower():
-                    if char.isalpha():
-                        char_sigml = f"{char}.sigml"
-                        char_sigml_path = os.path.join(SIGN_FILES_DIR, char_sigml)
-                        if os.path.exists(char_sigml_path):
-                            char_sigml_url = url_for('static', filename=f'SignFiles/{char_sigml}')
-                            spelling_files.append(char_sigml_url)
-                sentence_files.extend(spelling_files)
+
+            # The word's own sign, or character-by-character spelling
+            for gloss in lexicon_view.resolve(word):
+                sentence_files.append(lexicon_view.sign_urls[gloss])
         sigml_file_urls.append(sentence_files)
     return sigml_file_urls
 
-def clear_all():
-    final_words.clear()
-    final_output_in_sent.clear()
-    sent_list.clear()
-    sent_list_detailed.clear()
-    word_list.clear()
-    word_list_detailed.clear()
-    final_words_detailed.clear()
-    final_words_dict.clear()
-
-# Serve static files from custom directory
+def translation_glosses(translation, lexicon_view=None):
+    """The glosses signed for a translation, in order: one per SiGML file"""
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+    return [gloss for words in translation.isl_text for word in words if word
+            for gloss in lexicon_view.resolve(word)]
+
+def speech_span(segment):
+    """(start, end) of the speech in a transcript segment: its words if timed, else the segment"""
+    if segment.words:
+        return segment.words[0][0], segment.words[-1][1]
+    return segment.start, segment.end
+
+def translate_segments(text, segments, lexicon_view=None):
+    """Translate transcript segments one by one; returns (translation of text, timeline).
+
+    Both come from the same per-segment translations, so the translation's
+    glosses are exactly the signs on the timeline.
+    """
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+    segments = [seg for seg in segments if seg.text.strip()]
+    translations = translate_batch([seg.text for seg in segments], lexicon_view)
+    translation = ISLTranslation(
+        text=text,
+        sentences=tuple(sentence for part in translations for sentence in part.sentences),
+        isl_text=tuple(words for part in translations for words in part.isl_text),
+        sigml_files=tuple(files for part in translations for files in part.sigml_files),
+        lexicon_version=lexicon_view.version,
+    )
+    return translation, build_timeline(segments, translations, lexicon_view)
+
+def build_timeline(segments, translations, lexicon_view=None, after=0.0):
+    """Schedule the signs of transcript segments, given their translations, on the media clock.
+
+    Returns [{'start', 'end', 'gloss', 'sigml'}] in playback order. A segment's
+    signs start when its speech does (or when the previous sign ends, and no
+    earlier than after) and last their estimated signing time, sped up by at
+    most TIMELINE_MAX_SPEEDUP to end before the next segment's speech.
+    translations holds one ISLTranslation per segment (see translate_segments),
+    so each sign stays near its words.
+    """
+    if lexicon_view is None:
+        lexicon_view = sign_lexicon.current()
+
+    timeline = []
+    clock = after
+    for i, (seg, translation) in enumerate(zip(segments, translations)):
+        glosses = translation_glosses(translation, lexicon_view)
+        if not glosses:
+            continue
+        durations = [lexicon_view.sign_seconds(gloss) for gloss in glosses]
+        start = max(speech_span(seg)[0], clock)
+        # Aim to finish before the next segment's speech (or this segment's end, for the last one)
+        deadline = speech_span(segments[i + 1])[0] if i + 1 < len(segments) else seg.end
+        total = sum(durations)
+        if total > deadline - start:
+            scale = max((deadline - start) / total, 1 / TIMELINE_MAX_SPEEDUP)
+            durations = [seconds * scale for seconds in durations]
+        for gloss, seconds in zip(glosses, durations):
+            timeline.append({'start': round(start, 3), 'end': round(start + seconds, 3),
+                             'gloss': gloss, 'sigml': lexicon_view.sign_urls[gloss]})
+            start += seconds
+        clock = start
+    return timeline
+
+@app.route('/media/<filename>')
+def uploaded_media(filename):
+    """Uploaded media for the player, from memory or UPLOAD_DIR (with Range support for seeking)"""
+    content = memory_media.get(filename)
+    if content is None:
+        return send_from_directory(UPLOAD_DIR, filename)
+    response = Response(content, mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    # Stored names are unique per upload and never reused
+    response.set_etag(filename.rsplit('.', 1)[0])
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(content))
+
+class StaticAssets:
+    """Serves static/ using the manifest written by build_static.py.
+
+    Built files get a content-hash ETag, their gzip or brotli variant when the
+    client accepts it, and a fingerprinted URL ("js/script.1a2b3c4d.js") that
+    is cached as immutable. Files missing from the manifest, or changed since
+    the build, are served as they are with a short cache lifetime.
+    """
+
+    def __init__(self, static_dir, build_dir):
+        self.static_dir = static_dir
+        self.build_dir = build_dir
+        self.files = {}
+        manifest_path = os.path.join(build_dir, STATIC_MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('format') == STATIC_MANIFEST_FORMAT:
+                self.files = manifest['files']
+            else:
+                logging.warning(f"Ignoring {manifest_path}: rerun build_static.py")
+        # Fingerprinted path -> path under static_dir
+        self.fingerprints = {entry['fingerprinted']: path for path, entry in self.files.items()}
+
+    def _built_entry(self, path):
+        """The manifest entry for path, unless the file changed after the build"""
+        entry = self.files.get(path)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.static_dir, path))
+        except OSError:
+            return None
+        if stat.st_size != entry['size'] or stat.st_mtime_ns != entry['mtime_ns']:
+            return None
+        return entry
+
+    def url_path(self, path):
+        """Fingerprinted form of path when it is built and unchanged"""
+        entry = self._built_entry(path)
+        return entry['fingerprinted'] if entry is not None else path
+
+    def send(self, path):
+        immutable = path in self.fingerprints
+        if immutable:
+            path = self.fingerprints[path]
+        max_age = SIGN_FILE_MAX_AGE_SECONDS if path.startswith('SignFiles/') else STATIC_MAX_AGE_SECONDS
+        entry = self._built_entry(path)
+        if entry is None:
+            return send_from_directory(self.static_dir, path, max_age=max_age)
+
+        file_path = os.path.join(self.static_dir, path)
+        encoding = None
+        for candidate, suffix in STATIC_ENCODINGS.items():
+            variant_path = os.path.join(self.build_dir, path + suffix)
+            if (candidate in entry['encodings'] and request.accept_encodings[candidate]
+                    and os.path.isfile(variant_path)):
+                file_path, encoding = variant_path, candidate
+                break
+
+        # Each variant has its own ETag so ranges are never mixed between them
+        etag = entry['hash'][:20] + (f'-{encoding}' if encoding else '')
+        response = send_file(file_path, mimetype=mimetypes.guess_type(path)[0] or 'application/octet-stream',
+                             etag=etag, conditional=True,
+                             max_age=STATIC_IMMUTABLE_MAX_AGE_SECONDS if immutable else max_age)
+        if immutable:
+            response.cache_control.immutable = True
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry['encodings']:
+            response.vary.add('Accept-Encoding')
+        return response
+
+static_assets = StaticAssets(STATIC_DIR, STATIC_BUILD_DIR)
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    # url_for('static', filename=...) links to the fingerprinted file when there is one
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = static_assets.url_path(values['filename'])
+
+@app.route('/static/<path:filename>', endpoint='static')
+def serve_static(filename):
+    return static_assets.send(filename)
+
+# CWASA player files
 @app.route('/jas/loc2021/cwa/<path:filename>')
 def serve_jas_files(filename):
-    jas_dir = os.path.join(BASE_PATH, 'jas', 'loc2021', 'cwa')
-    return send_from_directory(jas_dir, filename)
-
-@app.route('/static/<path:path>')
-def serve_signfiles(path):
-    return send_from_directory('static', path)
+    return static_assets.send(f'jas/loc2021/cwa/{filename}')
 
 def cleanup_old_files(max_age_hours=24):
     """Clean up uploaded files older than max_age_hours"""
@@ -566,7 +2895,7 @@ def test_isl_reordering():
     
     for sentence in test_sentences:
         original = " ".join(sentence)
-        reordered = advanced_isl_reorder(句子)
+        reordered = advanced_isl_reorder(sentence)
         reordered_text = " ".join(reordered)
         
         print(f"English: {original}")
@@ -576,6 +2905,12 @@ def test_isl_reordering():
 if __name__ == '__main__':
     os.makedirs(UPLOAD_DIR, exist_ok=True)
     os.makedirs(SIGN_FILES_DIR, exist_ok=True)
+
+    # Load models in the background; /readyz reports when they are warmed up.
+    # The debug reloader also runs this block in its watcher process, which
+    # never serves requests, so only the serving child starts loading.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        models.start()
     
     # Optional: Run ISL reordering test
     # test_isl_reordering()
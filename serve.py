@@ -0,0 +1,148 @@
+"""Serve the app with several worker processes that share preloaded state.
+
+The NLP backend and the sign lexicon (every sign file, read once) are loaded
+in the parent process, which then forks gunicorn workers that share those
+pages copy-on-write. Whisper is loaded by each worker after the fork, in the
+background as usual (/readyz reports when it is ready): CTranslate2 starts
+its inference threads when a model is loaded, and threads do not survive
+fork().
+
+    python serve.py [--workers 4] [--threads 8] [--bind 0.0.0.0:8000]
+
+With more than one worker, state the workers must see in common moves out of
+process memory: job status goes to ISL_JOB_STATE_DIR, metrics to
+PROMETHEUS_MULTIPROC_DIR (both default to a temporary directory removed on
+exit), and uploads are served from disk instead of memory. Whisper and torch
+threads and chunked transcription processes are divided between the workers
+unless set explicitly. `python main.py` remains the development server.
+"""
+import argparse
+import gc
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+SERVE_WORKERS = int(os.environ.get('ISL_SERVE_WORKERS', str(os.cpu_count() or 1)))
+# Threads per worker; each live session and job event stream holds one
+SERVE_THREADS = int(os.environ.get('ISL_SERVE_THREADS', '8'))
+SERVE_BIND = os.environ.get('ISL_SERVE_BIND', '0.0.0.0:8000')
+# A worker that stops answering the master for this long is restarted; requests
+# run in worker threads, so long transcriptions do not count against it
+SERVE_TIMEOUT_SECONDS = int(os.environ.get('ISL_SERVE_TIMEOUT_SECONDS', '120'))
+
+
+def configure_environment(workers):
+    """Settings main reads at import; returns the temporary state directory to remove on exit (or None)"""
+    cores_per_worker = str(max(1, (os.cpu_count() or 1) // workers))
+    os.environ.setdefault('ISL_WHISPER_CPU_THREADS', cores_per_worker)
+    os.environ.setdefault('ISL_TRANSCRIBE_PROCESSES', cores_per_worker)
+    if workers < 2:
+        return None
+
+    state_dir = tempfile.mkdtemp(prefix='isl-serve-')
+    for variable, name in (('PROMETHEUS_MULTIPROC_DIR', 'metrics'), ('ISL_JOB_STATE_DIR', 'jobs')):
+        if variable not in os.environ:
+            os.environ[variable] = os.path.join(state_dir, name)
+            os.makedirs(os.environ[variable])
+    # The player may fetch an upload from any worker, so only the disk copy will do
+    os.environ.setdefault('ISL_MEMORY_MEDIA_MB', '0')
+    return state_dir
+
+
+def set_torch_threads(count):
+    """Stanza runs on torch, whose OpenMP thread pool does not survive fork()"""
+    import main
+
+    if main.NLP_BACKEND == 'stanza':
+        import torch
+        torch.set_num_threads(count)
+
+
+def preload():
+    """Load everything the workers can share; runs once, in the parent"""
+    import main
+
+    os.makedirs(main.UPLOAD_DIR, exist_ok=True)
+    os.makedirs(main.SIGN_FILES_DIR, exist_ok=True)
+
+    lexicon_view = main.sign_lexicon.current()
+    lexicon_view.preload()
+    logging.info(f"Preloaded {len(lexicon_view)} signs")
+
+    # Single-threaded until forked, so no OpenMP pool exists yet
+    set_torch_threads(1)
+    try:
+        main.models.preload()
+    except Exception as e:
+        # Each worker tries again and reports the failure on /readyz
+        logging.error(f"Error preloading the NLP backend: {e}")
+
+    # Objects loaded so far are never collected, so the collector does not
+    # touch (and copy) their pages in every worker
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import main
+
+    set_torch_threads(max(1, (os.cpu_count() or 1) // server.cfg.workers))
+    main.models.start()
+
+
+def child_exit(server, worker):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def gunicorn_application(app, options):
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            for name, value in options.items():
+                self.cfg.set(name, value)
+
+        def load(self):
+            return app
+
+    return PreloadedApplication()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=SERVE_WORKERS,
+                        help='worker processes (default: ISL_SERVE_WORKERS or the CPU count)')
+    parser.add_argument('--threads', type=int, default=SERVE_THREADS, help='threads per worker')
+    parser.add_argument('--bind', default=SERVE_BIND)
+    parser.add_argument('--timeout', type=int, default=SERVE_TIMEOUT_SECONDS)
+    args = parser.parse_args()
+
+    state_dir = configure_environment(args.workers)
+    # Imported only now: prometheus_client picks its storage when imported
+    import main
+
+    parent_pid = os.getpid()
+    try:
+        preload()
+        gunicorn_application(main.app, {
+            'bind': args.bind,
+            'workers': args.workers,
+            'worker_class': 'gthread',
+            'threads': args.threads,
+            'timeout': args.timeout,
+            'preload_app': True,
+            'post_fork': post_fork,
+            'child_exit': child_exit,
+        }).run()
+    finally:
+        # Exiting workers unwind through here too
+        if state_dir is not None and os.getpid() == parent_pid:
+            shutil.rmtree(state_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())